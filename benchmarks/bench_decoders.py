@@ -0,0 +1,45 @@
+"""JSONデコーダーのバックエンドを比較する
+
+python -m benchmarks.bench_decoders --sessions 100 1000 5000
+"""
+
+import argparse
+import json
+import timeit
+
+from benchmarks.payloads import generate_payload
+from pyconjp_domains.decoders import available_backends
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sessions", type=int, nargs="*", default=[100, 1000, 5000]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    backends = available_backends()
+    print(
+        f"{'sessions':>8} {'bytes':>10} "
+        + " ".join(f"{n:>10}" for n in backends)
+    )
+    for sessions in args.sessions:
+        body = json.dumps(
+            generate_payload(sessions), ensure_ascii=False
+        ).encode("utf-8")
+        expected = json.loads(body)
+        timings = []
+        for name, loads in backends.items():
+            assert loads(body) == expected, name
+            best = min(
+                timeit.repeat(
+                    lambda: loads(body), number=1, repeat=args.repeat
+                )
+            )
+            timings.append(f"{best * 1000:>8.2f}ms")
+        print(f"{sessions:>8} {len(body):>10} " + " ".join(timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""モックサーバーを相手にfetch_talksとretrieve_talks_in_timetableを計測する
+
+python -m benchmarks.bench_end_to_end --sizes 100 1000 --latency 0.02
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.mock_sessionize import (
+    MockSessionizeServer,
+    add_payload_arguments,
+)
+from pyconjp_domains.__main__ import (
+    WEBSITE_TIMETABLE_FIELDS,
+    retrieve_talks_in_timetable,
+)
+from pyconjp_domains.cache import HttpCache
+from pyconjp_domains.core import fetch_talks, sessionize_url
+from pyconjp_domains.transport import Transport
+
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run(sessions, args):
+    server = MockSessionizeServer(
+        sessions=sessions,
+        speakers=args.speakers,
+        rooms=args.rooms,
+        days=args.days,
+        latency=args.latency,
+        error_rate=args.error_rate,
+    )
+    server.start()
+    os.environ["SESSIONIZE_API_BASE_URL"] = server.base_url
+    os.environ["ENDPOINT_ID"] = "bench"
+    url = sessionize_url("bench")
+    transport = Transport(backoff_factor=0.01)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            cache = HttpCache(directory, transport=transport)
+            output = Path(directory, "timetable.csv")
+            cases = {
+                "fetch_talks": lambda: fetch_talks(url, transport=transport),
+                "stream": lambda: fetch_talks(
+                    url, stream=True, transport=transport
+                ),
+                "cache(304)": lambda: fetch_talks(url, cache),
+                "timetable": lambda: retrieve_talks_in_timetable(
+                    output, WEBSITE_TIMETABLE_FIELDS, transport=transport
+                ),
+            }
+            # キャッシュを温めておく
+            fetch_talks(url, cache)
+            return {
+                name: measure(func, args.repeat)
+                for name, func in cases.items()
+            }
+    finally:
+        transport.close()
+        server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_payload_arguments(parser)
+    parser.set_defaults(sessions=None)
+    parser.add_argument(
+        "--sizes", type=int, nargs="*", default=[100, 1000, 5000]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sizes = [args.sessions] if args.sessions else args.sizes
+    for sessions in sizes:
+        results = run(sessions, args)
+        print(
+            f"{sessions:>6} sessions: "
+            + "  ".join(f"{k}={v * 1000:.1f}ms" for k, v in results.items())
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""IncrementalTalksBuilderの作り直しと、create_talks_from_dataの全体の組み立てを比べる
+
+python -m benchmarks.bench_incremental --sessions 100 1000 5000
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks.payloads import generate_payload
+from pyconjp_domains.core import create_talks_from_data
+from pyconjp_domains.incremental import IncrementalTalksBuilder
+
+
+def fetched_copies(payload, count, change=False):
+    """取得し直したときと同じく、別々のオブジェクトのペイロードを作る
+
+    changeを指定すると、i番目のコピーでは先頭からi + 1件のトークのタイトルを変える。
+    つまり1つ前のコピーとは、トーク1件だけが違う。
+    """
+    body = json.dumps(payload, ensure_ascii=False)
+    copies = [json.loads(body) for _ in range(count)]
+    if change:
+        talks = [s for s in copies[0]["sessions"] if not s["isServiceSession"]]
+        for i, data in enumerate(copies):
+            changed_ids = {talk["id"] for talk in talks[: i + 1]}
+            for session in data["sessions"]:
+                if session["id"] in changed_ids:
+                    session["title"] += "（変更）"
+    return copies
+
+
+def measure(func, payloads):
+    timings = []
+    for data in payloads:
+        start = time.perf_counter()
+        func(data)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sessions", type=int, nargs="*", default=[100, 1000, 5000]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'sessions':>8} {'full':>10} {'one changed':>12} {'unchanged':>10}"
+    )
+    for sessions in args.sessions:
+        payload = generate_payload(sessions)
+        full = measure(
+            create_talks_from_data, fetched_copies(payload, args.repeat)
+        )
+
+        builder = IncrementalTalksBuilder()
+        builder.build(fetched_copies(payload, 1)[0])
+        unchanged = measure(
+            builder.build, fetched_copies(payload, args.repeat)
+        )
+        assert builder.rebuilt_count == 0, builder.rebuilt_count
+        changed = measure(
+            builder.build, fetched_copies(payload, args.repeat, change=True)
+        )
+        assert builder.rebuilt_count == 1, builder.rebuilt_count
+        print(
+            f"{sessions:>8} {full * 1000:>8.2f}ms {changed * 1000:>10.2f}ms"
+            f" {unchanged * 1000:>8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
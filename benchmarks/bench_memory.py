@@ -0,0 +1,54 @@
+"""トークを組み立てたときのメモリ使用量をtracemallocで計測する
+
+python -m benchmarks.bench_memory --sessions 1000 10000
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.payloads import generate_payload
+from pyconjp_domains.columnar import ColumnarScheduledTalks
+from pyconjp_domains.core import create_talks_from_data
+
+
+def create_columnar_talks(data):
+    return ColumnarScheduledTalks.from_talks(create_talks_from_data(data))
+
+
+def measure(data, create=create_talks_from_data, **options):
+    """組み立てたトークが保持しているバイト数を返す（dataの分は含まない）"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    talks = create(data, **options)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return talks, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sessions", type=int, nargs="*", default=[1000, 10000]
+    )
+    args = parser.parse_args()
+
+    print(f"{'sessions':>8} {'mode':>6} {'bytes':>12} {'bytes/talk':>10}")
+    for sessions in args.sessions:
+        data = generate_payload(sessions)
+        for mode, options in (
+            ("eager", {}),
+            ("lazy", {"lazy": True}),
+            ("column", {"create": create_columnar_talks}),
+        ):
+            talks, size = measure(data, **options)
+            print(
+                f"{sessions:>8} {mode:>6} {size:>12} "
+                f"{size / len(talks):>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""sessionizeの /api/v2/{id}/view/All を模したローカルサーバー
+
+python -m benchmarks.mock_sessionize --sessions 1000 --latency 0.05
+SESSIONIZE_API_BASE_URL=http://127.0.0.1:8000/api/v2 ENDPOINT_ID=bench \\
+    python -m pyconjp_domains timetable timetable.csv
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.payloads import generate_payload
+
+_PATH_PATTERN = re.compile(r"^/api/v2/([^/]+)/view/All$")
+
+
+class MockSessionizeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        if server.latency:
+            time.sleep(server.latency)
+
+        match = _PATH_PATTERN.match(self.path)
+        if not match:
+            return self._respond(404, b"Not Found")
+        if server.error_rate and server.rng.random() < server.error_rate:
+            return self._respond(503, b"Service Unavailable")
+
+        body, etag = server.payload_for(match.group(1))
+        if self.headers.get("If-None-Match") == etag:
+            return self._respond(304, b"", {"ETag": etag})
+        headers = {"Content-Type": "application/json", "ETag": etag}
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = server.gzipped_payload_for(match.group(1))
+            headers["Content-Encoding"] = "gzip"
+        self._respond(200, body, headers)
+
+    def _respond(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockSessionizeServer(ThreadingHTTPServer):
+    """エンドポイントIDごとに合成データを作って返す
+
+    latency秒待ってから応答し、error_rateの割合で503を返す。
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address=("127.0.0.1", 0),
+        sessions=100,
+        speakers=None,
+        rooms=3,
+        days=2,
+        latency=0.0,
+        error_rate=0.0,
+        seed=0,
+    ):
+        super().__init__(address, MockSessionizeHandler)
+        self.payload_options = {
+            "sessions": sessions,
+            "speakers": speakers,
+            "rooms": rooms,
+            "days": days,
+        }
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self._payloads = {}
+        self._gzipped = {}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/v2"
+
+    def payload_for(self, endpoint_id):
+        with self._lock:
+            if endpoint_id not in self._payloads:
+                seed = int(hashlib.md5(endpoint_id.encode()).hexdigest(), 16)
+                payload = generate_payload(**self.payload_options, seed=seed)
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+                self._payloads[endpoint_id] = (body, etag)
+            return self._payloads[endpoint_id]
+
+    def gzipped_payload_for(self, endpoint_id):
+        body, _ = self.payload_for(endpoint_id)
+        with self._lock:
+            if endpoint_id not in self._gzipped:
+                self._gzipped[endpoint_id] = gzip.compress(body)
+            return self._gzipped[endpoint_id]
+
+    def start(self):
+        """バックグラウンドのスレッドで起動する"""
+        thread = threading.Thread(
+            target=self.serve_forever, args=(0.05,), daemon=True
+        )
+        thread.start()
+        return thread
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def add_payload_arguments(parser):
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--speakers", type=int)
+    parser.add_argument("--rooms", type=int, default=3)
+    parser.add_argument("--days", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    add_payload_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockSessionizeServer(
+        (args.host, args.port),
+        sessions=args.sessions,
+        speakers=args.speakers,
+        rooms=args.rooms,
+        days=args.days,
+        latency=args.latency,
+        error_rate=args.error_rate,
+    )
+    print(f"Serving on {server.base_url}/{{id}}/view/All")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
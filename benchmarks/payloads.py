@@ -0,0 +1,158 @@
+"""sessionizeの view/All と同じ形の合成データを作る"""
+
+import random
+from datetime import datetime, timedelta
+
+from pyconjp_domains.constants import SESSIONIZE_DATETIME_FORMAT
+
+QUESTIONS = [
+    {"id": 30014, "question": "Elevator Pitch"},
+    {
+        "id": 30016,
+        "question": "オーディエンスが持って帰れる具体的な知識やノウハウ",
+    },
+    {"id": 30018, "question": "オーディエンスに求める前提知識"},
+]
+
+CATEGORIES = [
+    {
+        "id": 30011,
+        "title": "Track",
+        "items": [
+            {"id": 80045, "name": "Python core and around"},
+            {"id": 80046, "name": "Machine learning"},
+            {"id": 80047, "name": "Web programming"},
+            {"id": 80043, "name": "Visual / Game / Music"},
+            {"id": 80050, "name": "Approaching to social problem"},
+        ],
+    },
+    {
+        "id": 30012,
+        "title": "Level",
+        "items": [
+            {"id": 80018, "name": "Beginner"},
+            {"id": 80019, "name": "Intermediate"},
+            {"id": 80020, "name": "Advanced"},
+        ],
+    },
+    {
+        "id": 30013,
+        "title": "Language",
+        "items": [
+            {"id": 80022, "name": "English"},
+            {"id": 80023, "name": "Japanese"},
+        ],
+    },
+    {
+        "id": 30015,
+        "title": "発表資料の言語 / Language of presentation material",
+        "items": [
+            {"id": 80025, "name": "English only"},
+            {"id": 80026, "name": "Japanese only"},
+            {"id": 80024, "name": "Both"},
+        ],
+    },
+]
+
+_WORDS = [
+    "Python",
+    "型ヒント",
+    "非同期処理",
+    "機械学習",
+    "Webアプリケーション",
+    "テスト",
+    "パフォーマンス",
+    "データ分析",
+    "パッケージング",
+    "asyncio",
+    "Django",
+    "pandas",
+    "コミュニティ",
+    "自動化",
+]
+
+
+def _text(rng, words):
+    return "、".join(rng.choice(_WORDS) for _ in range(words)) + "。"
+
+
+def generate_payload(sessions=100, speakers=None, rooms=3, days=2, seed=0):
+    """sessions個のトークを持つペイロードを作る
+
+    各日の先頭はOpening (サービスセッション) で、トークはrooms部屋に30分刻みで並べる。
+    """
+    rng = random.Random(seed)
+    speakers = speakers or max(1, sessions * 9 // 10)
+    room_data = [{"id": 20000 + i, "name": f"#room_{i}"} for i in range(rooms)]
+    speaker_data = [
+        {
+            "id": f"speaker-{i:06d}",
+            "fullName": f"スピーカー{i}",
+            "bio": _text(rng, 40),
+        }
+        for i in range(speakers)
+    ]
+    first_day = datetime(2021, 10, 15, 10, 0)
+    per_day = -(-sessions // days)
+
+    session_data = []
+    for day in range(days):
+        starts_at = first_day + timedelta(days=day)
+        session_data.append(
+            _service_session(f"opening-{day}", starts_at, room_data[0]["id"])
+        )
+    for i in range(sessions):
+        day, index = divmod(i, per_day)
+        slot, room = divmod(index, rooms)
+        starts_at = first_day + timedelta(days=day, minutes=30 * (slot + 1))
+        categories = [rng.choice(c["items"])["id"] for c in CATEGORIES]
+        session_data.append(
+            {
+                "id": str(300000 + i),
+                "title": f"トーク{i}: {_text(rng, 3)}",
+                "description": _text(rng, 80),
+                "startsAt": starts_at.strftime(SESSIONIZE_DATETIME_FORMAT),
+                "endsAt": (starts_at + timedelta(minutes=30)).strftime(
+                    SESSIONIZE_DATETIME_FORMAT
+                ),
+                "isServiceSession": False,
+                "isPlenumSession": False,
+                "speakers": [speaker_data[i % speakers]["id"]],
+                "categoryItems": categories,
+                "questionAnswers": [
+                    {"questionId": q["id"], "answerValue": _text(rng, 10)}
+                    for q in QUESTIONS
+                ],
+                "roomId": room_data[room]["id"],
+                "liveUrl": None,
+                "recordingUrl": None,
+            }
+        )
+
+    return {
+        "sessions": session_data,
+        "speakers": speaker_data,
+        "questions": QUESTIONS,
+        "categories": CATEGORIES,
+        "rooms": room_data,
+    }
+
+
+def _service_session(session_id, starts_at, room_id):
+    return {
+        "id": session_id,
+        "title": "Opening",
+        "description": None,
+        "startsAt": starts_at.strftime(SESSIONIZE_DATETIME_FORMAT),
+        "endsAt": (starts_at + timedelta(minutes=30)).strftime(
+            SESSIONIZE_DATETIME_FORMAT
+        ),
+        "isServiceSession": True,
+        "isPlenumSession": True,
+        "speakers": [],
+        "categoryItems": [],
+        "questionAnswers": [],
+        "roomId": room_id,
+        "liveUrl": None,
+        "recordingUrl": None,
+    }
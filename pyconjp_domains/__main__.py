@@ -1,8 +1,15 @@
 import argparse
 import csv
+import http.client
+import io
 import os
+import sys
+import time
 
-from pyconjp_domains.core import fetch_talks
+from pyconjp_domains.cache import HttpCache
+from pyconjp_domains.core import fetch_data, fetch_talks, sessionize_url
+from pyconjp_domains.files import write_atomically
+from pyconjp_domains.incremental import IncrementalTalksBuilder
 
 WEBSITE_TIMETABLE_FIELDS = [
     "id",
@@ -89,11 +96,8 @@ def bundle_processors(fields):
     return processors
 
 
-def retrieve_talks_in_timetable(output, field_arguments):
-    endpoint_id = os.environ["ENDPOINT_ID"]
-    url = f"https://sessionize.com/api/v2/{endpoint_id}/view/All"
-    talks = fetch_talks(url)
-
+def render_timetable(talks, field_arguments):
+    """タイムテーブルのCSVを文字列で返す"""
     fields, headers = parse_field_arguments(field_arguments)
 
     rows = [talk.as_list(fields) for talk in talks.sorted()]
@@ -104,21 +108,153 @@ def retrieve_talks_in_timetable(output, field_arguments):
         for processor in processors:
             processor(row)
 
-    with open(output, "w", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerows([headers] + rows)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([headers] + rows)
+    return buffer.getvalue()
 
 
-if __name__ == "__main__":
+def read_if_exists(output):
+    try:
+        with open(output, encoding="utf-8", newline="") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def retrieve_talks_in_timetable(output, field_arguments, **fetch_options):
+    """fetch_optionsはfetch_talksにそのまま渡す"""
+    if fetch_options.get("snapshot") and "ENDPOINT_ID" not in os.environ:
+        # スナップショットからはENDPOINT_IDなしで読める
+        url = None
+    else:
+        endpoint_id = os.environ["ENDPOINT_ID"]
+        url = sessionize_url(endpoint_id)
+    talks = fetch_talks(url, **fetch_options)
+
+    content = render_timetable(talks, field_arguments)
+    write_atomically(output, content.encode("utf-8"))
+
+
+def watch_timetable(
+    output,
+    field_arguments,
+    interval,
+    cache=None,
+    transport=None,
+    iterations=None,
+):
+    """interval秒ごとにsessionizeをポーリングし、内容が変わったときだけCSVを置き換える
+
+    iterationsを指定するとその回数だけポーリングして終わる（テスト用）。
+    """
+    url = sessionize_url(os.environ["ENDPOINT_ID"])
+    builder = IncrementalTalksBuilder()
+    previous_data = None
+    rendered = read_if_exists(output)
+
+    count = 0
+    while iterations is None or count < iterations:
+        if count:
+            time.sleep(interval)
+        count += 1
+        try:
+            data = fetch_data(url, cache, transport)
+        # 読み込み途中で切れたとき (IncompleteRead) などもポーリングは続ける
+        except (OSError, ValueError, http.client.HTTPException) as e:
+            print(f"Failed to fetch {url}: {e}", file=sys.stderr)
+            continue
+        # キャッシュが304で同じオブジェクトを返したときは、比べるまでもない
+        if data is previous_data or data == previous_data:
+            continue
+        previous_data = data
+
+        try:
+            content = render_timetable(builder.build(data), field_arguments)
+        # 壊れたペイロード（存在しないスピーカーやroomの参照など）でも、次のポーリングは続ける
+        except Exception as e:
+            print(
+                f"Failed to build timetable from {url}: {e!r}", file=sys.stderr
+            )
+            continue
+        if content != rendered:
+            write_atomically(output, content.encode("utf-8"))
+            rendered = content
+
+
+def parse_arguments(argv=None):
     parser = argparse.ArgumentParser(
         description="Fetch talk data from sessionize."
     )
-    parser.add_argument("data_type", choices=("timetable",))
+    parser.add_argument("data_type", choices=("timetable", "watch"))
     parser.add_argument("output_csv")
     parser.add_argument(
         "--fields", nargs="*", default=WEBSITE_TIMETABLE_FIELDS
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--cache-dir", help="sessionizeの返り値をキャッシュするディレクトリ"
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=0,
+        help="再検証せずにキャッシュを使う秒数",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="レスポンスを逐次パースする（--cache-dirや--recordとは併用できない）",
+    )
+    parser.add_argument(
+        "--snapshot",
+        help="保存済みのスナップショット（ファイルかディレクトリ）を読む",
+    )
+    parser.add_argument(
+        "--record",
+        help="取得したレスポンスをスナップショットとして保存するパス",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=60,
+        help="watchでsessionizeをポーリングする間隔（秒）",
+    )
+    args = parser.parse_args(argv)
+    if args.data_type == "watch":
+        # watchはsessionizeをポーリングするので、一度きりの取得のオプションは使えない
+        for option in ("stream", "snapshot", "record"):
+            if getattr(args, option):
+                parser.error(f"--{option} cannot be used with watch")
+    # fetch_talksで使われないか、併用できないオプションの組合せ
+    conflicts = (
+        ("stream", "cache_dir"),
+        ("stream", "record"),
+        ("snapshot", "stream"),
+        ("snapshot", "cache_dir"),
+        ("snapshot", "record"),
+    )
+    for option, other in conflicts:
+        if getattr(args, option) and getattr(args, other):
+            parser.error(
+                f"--{option} cannot be used with --{other.replace('_', '-')}"
+            )
+    return args
+
 
+if __name__ == "__main__":
+    args = parse_arguments()
+
+    cache = (
+        HttpCache(args.cache_dir, args.cache_ttl) if args.cache_dir else None
+    )
     if args.data_type == "timetable":
-        retrieve_talks_in_timetable(args.output_csv, args.fields)
+        retrieve_talks_in_timetable(
+            args.output_csv,
+            args.fields,
+            cache=cache,
+            stream=args.stream,
+            snapshot=args.snapshot,
+            record=args.record,
+        )
+    elif args.data_type == "watch":
+        watch_timetable(args.output_csv, args.fields, args.interval, cache)
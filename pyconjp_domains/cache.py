@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from urllib.error import HTTPError
+
+from pyconjp_domains import decoders
+from pyconjp_domains.files import write_atomically
+from pyconjp_domains.transport import default_transport
+
+
+class HttpCache:
+    """sessionizeのAPIの返り値をディスクにキャッシュし、条件付きリクエストで再検証する
+
+    ttl秒以内のキャッシュはリクエストせずに返す。
+    ttlを過ぎたらETag / Last-Modifiedで再検証し、304ならキャッシュを返す。
+    """
+
+    def __init__(self, directory, ttl: float = 0, transport=None):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.transport = transport or default_transport
+        # パース済みの返り値。ボディのダイジェストが一致する間は使い回す
+        self._parsed = {}
+
+    def fetch(self, url: str):
+        meta = self._load_meta(url)
+        if meta is not None and time.time() - meta["fetched_at"] < self.ttl:
+            return self._load_data(url, meta)
+
+        try:
+            res, body = self.transport.request(
+                url, self._conditional_headers(meta)
+            )
+        except HTTPError as e:
+            if e.code != 304 or meta is None:
+                raise
+            meta["fetched_at"] = time.time()
+            self._write_meta(url, meta)
+            return self._load_data(url, meta)
+
+        meta = {
+            "url": url,
+            "etag": res.headers.get("ETag"),
+            "last_modified": res.headers.get("Last-Modified"),
+            "digest": hashlib.sha256(body).hexdigest(),
+            "fetched_at": time.time(),
+        }
+        self._write(self.body_path(url), body)
+        self._write_meta(url, meta)
+        data = decoders.loads(body)
+        self._parsed[url] = (meta["digest"], data)
+        return data
+
+    def body_path(self, url: str) -> Path:
+        return self.directory / f"{self._key(url)}.json"
+
+    def meta_path(self, url: str) -> Path:
+        return self.directory / f"{self._key(url)}.meta.json"
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _conditional_headers(meta) -> dict[str, str]:
+        headers = {}
+        if meta is None:
+            return headers
+        if meta["etag"]:
+            headers["If-None-Match"] = meta["etag"]
+        if meta["last_modified"]:
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def _load_meta(self, url):
+        meta_path = self.meta_path(url)
+        if not meta_path.exists() or not self.body_path(url).exists():
+            return None
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _load_data(self, url, meta):
+        cached = self._parsed.get(url)
+        if cached is not None and cached[0] == meta["digest"]:
+            return cached[1]
+        with open(self.body_path(url), "rb") as f:
+            data = decoders.loads(f.read())
+        self._parsed[url] = (meta["digest"], data)
+        return data
+
+    def _write_meta(self, url, meta):
+        self._write(self.meta_path(url), json.dumps(meta).encode("utf-8"))
+
+    def _write(self, path: Path, content: bytes):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        write_atomically(path, content)
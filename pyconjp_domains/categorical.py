@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import threading
+
+
+class Categorical:
+    """文字列と、登録した順に振る小さな整数の符号との対応表
+
+    同じ文字列にはいつも同じ符号を返し、decodeは最初に登録したインスタンスを返す。
+    Noneの符号は-1。
+    """
+
+    def __init__(self, values=()):
+        self._values = []
+        self._value_to_code = {None: -1}
+        self._ranks = None
+        self._lock = threading.Lock()
+        for value in values:
+            self.encode(value)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, value):
+        return value in self._value_to_code
+
+    def encode(self, value) -> int:
+        """valueの符号を返す。初めての値なら符号を振る"""
+        code = self._value_to_code.get(value)
+        if code is None:
+            with self._lock:
+                code = self._value_to_code.get(value)
+                if code is None:
+                    code = len(self._values)
+                    self._values.append(value)
+                    self._value_to_code[value] = code
+                    self._ranks = None
+        return code
+
+    def decode(self, code: int):
+        return self._values[code] if code >= 0 else None
+
+    def intern(self, value):
+        """valueと等しい、表に登録済みの文字列のインスタンスを返す"""
+        return self.decode(self.encode(value))
+
+    def code_of(self, value) -> int | None:
+        """valueの符号を返す。登録していない値ならNone（符号は振らない）"""
+        return self._value_to_code.get(value)
+
+    def codes_of(self, values) -> set[int]:
+        """valuesのうち登録済みの値の符号の集合"""
+        value_to_code = self._value_to_code
+        return {value_to_code[v] for v in values if v in value_to_code}
+
+    @property
+    def ranks(self) -> list[int]:
+        """符号から、文字列を辞書順に並べたときの順位を引く表"""
+        ranks = self._ranks
+        if ranks is None or len(ranks) != len(self._values):
+            values = list(self._values)
+            ranks = [0] * len(values)
+            order = sorted(range(len(values)), key=values.__getitem__)
+            for rank, code in enumerate(order):
+                ranks[code] = rank
+            self._ranks = ranks
+        return ranks
+
+
+# プロセス全体で共有する表。talks.pyのCategory / Slotが作られるときに符号を振る
+ROOMS = Categorical()
+TRACKS = Categorical()
+# 全員向けのsession (isPlenumSession) のLevel
+LEVELS = Categorical(["All"])
+# 話す言語と資料の言語で共有する
+LANGUAGES = Categorical()
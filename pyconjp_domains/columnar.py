@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+from datetime import date, time
+
+from pyconjp_domains.talks import (
+    Category,
+    ScheduledTalk,
+    ScheduledTalks,
+    Slot,
+    Talk,
+)
+
+
+def encode_strings(values):
+    """文字列の列を、辞書順に並べた文字列表と表のインデックスの配列にする
+
+    Noneは-1にする。表が辞書順なので、インデックスの大小は文字列の大小と一致する。
+    """
+    table = sorted({value for value in values if value is not None})
+    value_to_code = {value: code for code, value in enumerate(table)}
+    value_to_code[None] = -1
+    return table, array("i", [value_to_code[value] for value in values])
+
+
+def _column_property(name):
+    return property(lambda self: self._talks._columns[name][self._index])
+
+
+def _coded_property(name):
+    return property(lambda self: self._talks._decode(name, self._index))
+
+
+class ColumnarScheduledTalk:
+    """ColumnarScheduledTalksの1行を、ScheduledTalkと同じ属性で参照するビュー"""
+
+    __slots__ = ("_talks", "_index")
+
+    def __init__(self, talks, index):
+        self._talks = talks
+        self._index = index
+
+    id = _column_property("id")
+    title = _column_property("title")
+    description = _column_property("description")
+    answer = _column_property("answer")
+    speakers = _column_property("speakers")
+    duration_min = _column_property("duration_min")
+    slide_url = _column_property("slide_url")
+    recording_url = _column_property("recording_url")
+    slot_number = _column_property("slot_number")
+
+    room = _coded_property("room")
+    track = _coded_property("track")
+    level = _coded_property("level")
+    speaking_language = _coded_property("speaking_language")
+    slide_language = _coded_property("slide_language")
+
+    # answer / speakers を参照するだけなので、Talkのものをそのまま使う
+    elevator_pitch = Talk.elevator_pitch
+    prior_knowledge = Talk.prior_knowledge
+    take_away = Talk.take_away
+    speaker_names = Talk.speaker_names
+    speaker_profiles = Talk.speaker_profiles
+    as_list = Talk.as_list
+
+    @property
+    def day(self):
+        return date.fromordinal(self._talks._columns["day"][self._index])
+
+    @property
+    def start_time(self):
+        return time(
+            *divmod(self._talks._columns["start_time"][self._index], 60)
+        )
+
+    @property
+    def category(self):
+        if not self._talks._columns["has_category"][self._index]:
+            return None
+        return Category(
+            self.track, self.level, self.speaking_language, self.slide_language
+        )
+
+    @property
+    def slot(self):
+        return Slot(self.room, self.day, self.start_time, self.slot_number)
+
+    def materialize(self) -> ScheduledTalk:
+        return ScheduledTalk(
+            self.id,
+            self.title,
+            self.description,
+            self.category,
+            self.answer,
+            self.speakers,
+            self.slot,
+            self.duration_min,
+            self.slide_url,
+            self.recording_url,
+        )
+
+    def __eq__(self, other):
+        if isinstance(other, ColumnarScheduledTalk):
+            other = other.materialize()
+        if not isinstance(other, ScheduledTalk):
+            return NotImplemented
+        return self.materialize() == other
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.materialize()!r})"
+
+
+class ColumnarScheduledTalks(Sequence):
+    """ScheduledTalksを列ごとの配列で持つ
+
+    日付（序数）・開始時刻（0時からの分）・長さ・スロット番号は array('i') で、
+    room / track / level / 言語は文字列表へのインデックスの array('i') で持つ。
+    idやタイトルなどの文字列はリストのまま持つ（idはUUIDのこともある）。
+    """
+
+    _CODED_COLUMNS = (
+        "room",
+        "track",
+        "level",
+        "speaking_language",
+        "slide_language",
+    )
+
+    def __init__(self, columns, tables, rows=None):
+        self._columns = columns
+        self._tables = tables
+        # 列の何行目をどの順で見せるか
+        if rows is None:
+            rows = array("i", range(len(columns["id"])))
+        self._rows = rows
+
+    @classmethod
+    def from_talks(cls, talks):
+        talks = list(talks)
+        columns = {
+            "id": [t.id for t in talks],
+            "title": [t.title for t in talks],
+            "description": [t.description for t in talks],
+            "answer": [t.answer for t in talks],
+            "speakers": [t.speakers for t in talks],
+            "slide_url": [t.slide_url for t in talks],
+            "recording_url": [t.recording_url for t in talks],
+            "has_category": array(
+                "b", [t.category is not None for t in talks]
+            ),
+            "day": array("i", [t.day.toordinal() for t in talks]),
+            "start_time": array(
+                "i",
+                [t.start_time.hour * 60 + t.start_time.minute for t in talks],
+            ),
+            "duration_min": array("i", [t.duration_min for t in talks]),
+            "slot_number": array("i", [t.slot_number for t in talks]),
+        }
+        tables = {}
+        for name in cls._CODED_COLUMNS:
+            tables[name], columns[name] = encode_strings(
+                [getattr(t, name) for t in talks]
+            )
+        return cls(columns, tables)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self._take(range(len(self))[key])
+        return ColumnarScheduledTalk(self, self._rows[key])
+
+    def __eq__(self, other):
+        if not isinstance(other, (ColumnarScheduledTalks, ScheduledTalks)):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other)
+        )
+
+    def _decode(self, name, index):
+        code = self._columns[name][index]
+        return self._tables[name][code] if code >= 0 else None
+
+    def _take(self, indices):
+        """indicesの順に行を並べた新しいColumnarScheduledTalksを返す
+
+        列と文字列表はコピーせずに共有し、行番号の配列だけを作る。
+        """
+        rows = self._rows
+        return self.__class__(
+            self._columns,
+            self._tables,
+            array("i", map(rows.__getitem__, indices)),
+        )
+
+    def _sort_keys(self):
+        """(day, slot_number, room) を列の行ごとに1つの整数に詰めたもの
+
+        文字列表は辞書順なので、roomのインデックスの大小は文字列の大小と一致する。
+        列を共有するビューの間で使い回す。
+        """
+        if "sort_key" not in self._columns:
+            days = self._columns["day"]
+            slot_numbers = self._columns["slot_number"]
+            min_day = min(days, default=0)
+            min_slot_number = min(slot_numbers, default=0)
+            slot_number_span = max(slot_numbers, default=0) - min_slot_number
+            # Noneの-1も入るように1つずらす
+            room_span = len(self._tables["room"]) + 1
+            self._columns["sort_key"] = [
+                (
+                    (day - min_day) * (slot_number_span + 1)
+                    + slot_number
+                    - min_slot_number
+                )
+                * room_span
+                + room
+                + 1
+                for day, slot_number, room in zip(
+                    days, slot_numbers, self._columns["room"]
+                )
+            ]
+        return self._columns["sort_key"]
+
+    def sorted(self):
+        """ScheduledTalks.sortedと同じ (day, slot_number, room) の順に並べる
+
+        詰めた整数に今の位置を足し込んで、整数のソート1回で安定に並べる。
+        """
+        sort_keys = self._sort_keys()
+        size = len(self)
+        keys = [sort_keys[row] * size + i for i, row in enumerate(self._rows)]
+        keys.sort()
+        return self._take([key % size for key in keys])
+
+    def where(self, **conditions):
+        """room / track / level / 言語の値が一致する行だけを返す
+
+        文字列ではなく文字列表のインデックス同士で比較する。
+        """
+        rows = self._rows
+        for name, value in conditions.items():
+            if name not in self._CODED_COLUMNS:
+                raise ValueError(f"Unknown column: {name}")
+            table = self._tables[name]
+            if value is None:
+                code = -1
+            elif value in table:
+                code = table.index(value)
+            else:
+                rows = []
+                break
+            column = self._columns[name]
+            rows = [row for row in rows if column[row] == code]
+        return self.__class__(self._columns, self._tables, array("i", rows))
+
+    def to_scheduled_talks(self) -> ScheduledTalks:
+        return ScheduledTalks([talk.materialize() for talk in self])
@@ -1 +1,2 @@
 SESSIONIZE_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+SESSIONIZE_API_BASE_URL = "https://sessionize.com/api/v2"
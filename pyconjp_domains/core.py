@@ -1,6 +1,11 @@
-import json
-from urllib.request import urlopen
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 
+from pyconjp_domains import decoders
+from pyconjp_domains.constants import SESSIONIZE_API_BASE_URL
 from pyconjp_domains.factories import (
     CategoryFactory,
     QuestionAnswerFactory,
@@ -8,12 +13,35 @@ from pyconjp_domains.factories import (
     SlotFactory,
     SpeakerFactory,
 )
+from pyconjp_domains.snapshots import (
+    open_snapshot,
+    resolve_snapshots,
+    save_snapshot,
+)
+from pyconjp_domains.streaming import iter_sections
 from pyconjp_domains.talks import ScheduledTalks
+from pyconjp_domains.transport import Transport, default_transport
+
+
+def sessionize_url(endpoint_id):
+    # 環境変数でモックサーバーなどに向け先を変えられる
+    base_url = os.environ.get(
+        "SESSIONIZE_API_BASE_URL", SESSIONIZE_API_BASE_URL
+    )
+    return f"{base_url}/{endpoint_id}/view/All"
 
 
-def fetch_data(url):
-    with urlopen(url) as res:
-        return json.load(res)
+def fetch_data(url, cache=None, transport=None, record=None):
+    """recordを指定すると、レスポンスのボディをスナップショットとして保存する"""
+    if cache is not None:
+        data = cache.fetch(url)
+        if record is not None:
+            save_snapshot(record, url, cache.body_path(url).read_bytes())
+        return data
+    _, body = (transport or default_transport).request(url)
+    if record is not None:
+        save_snapshot(record, url, body)
+    return decoders.loads(body)
 
 
 def is_included(title):
@@ -38,31 +66,212 @@ def _filter_with_modal_sessions(sessions):
             yield session
 
 
-def create_talks_from_data(data):
-    sessions = list(filter_sessions(data["sessions"]))
+def create_talk_factory(
+    data, sessions, question_titles=None, speaker_factory=None
+):
+    """タイムテーブルに載せるsessionsからScheduledTalkFactoryを作る
 
+    question_titlesはQuestionAnswerFactoryに渡す（年ごとに質問のタイトルが違う場合）。
+    speaker_factoryを渡すとそれを使う（省略するとdata["speakers"]から作る）。
+    """
     category_factory = CategoryFactory.from_(data["categories"])
-    question_answer_factory = QuestionAnswerFactory.from_(data["questions"])
-    speaker_factory = SpeakerFactory.from_(data["speakers"])
+    question_answer_factory = QuestionAnswerFactory.from_(
+        data["questions"], question_titles
+    )
+    if speaker_factory is None:
+        speaker_factory = SpeakerFactory.from_(data["speakers"])
     slot_factory = SlotFactory.from_(
         data["rooms"],
         set(s["startsAt"] for s in _filter_with_modal_sessions(sessions)),
     )
-    talk_factory = ScheduledTalkFactory(
+    return ScheduledTalkFactory(
         category_factory,
         question_answer_factory,
         speaker_factory,
         slot_factory,
     )
 
-    talks = []
-    for session in sessions:
-        talk = talk_factory.create(session)
-        talks.append(talk)
 
-    return ScheduledTalks(talks)
+# ワーカープロセスごとに、プールの初期化時に1度だけ受け取るScheduledTalkFactory
+_worker_talk_factory = None
+
+
+def _initialize_worker(talk_factory):
+    global _worker_talk_factory
+    _worker_talk_factory = talk_factory
+
+
+def _create_talks_in_worker(sessions):
+    return _worker_talk_factory.create_many(sessions)
+
+
+def _create_talks_in_parallel(talk_factory, sessions, workers):
+    # ワーカー間で偏りが出ないよう、ワーカー数より細かく分ける
+    chunk_size = max(1, -(-len(sessions) // (workers * 4)))
+    chunks = [
+        sessions[i : i + chunk_size]
+        for i in range(0, len(sessions), chunk_size)
+    ]
+    with ProcessPoolExecutor(
+        workers,
+        initializer=_initialize_worker,
+        initargs=(talk_factory,),
+    ) as executor:
+        # mapは投入した順に結果を返すので、並びは直列に作った場合と同じになる
+        talks = [
+            talk
+            for chunk_talks in executor.map(_create_talks_in_worker, chunks)
+            for talk in chunk_talks
+        ]
+    # チャンクごとにunpickleしたCategoryやSpeakerはチャンクをまたいで共有されないので、
+    # 親のファクトリのインスタンスに置き換え、スピーカーから引けるように登録する
+    for session, talk in zip(sessions, talks):
+        talk.category = talk_factory.create_category(session)
+        talk.speakers = talk_factory.create_speakers(session)
+        talk_factory.register_talk(session, talk)
+    return talks
+
+
+def create_talks_from_data(
+    data, lazy=False, workers=None, question_titles=None
+):
+    """トークを組み立てる
+
+    lazy=Trueのとき、各トークは属性を参照したときに組み立てる（dataを保持し続ける）。
+    workersを指定すると、その数のプロセスでsessionsを分担して組み立てる。
+    """
+    if lazy and workers:
+        raise ValueError("lazy cannot be combined with workers")
+    sessions = list(filter_sessions(data["sessions"]))
+    talk_factory = create_talk_factory(data, sessions, question_titles)
+
+    if lazy:
+        talks = [talk_factory.create_lazy(session) for session in sessions]
+    elif workers:
+        talks = _create_talks_in_parallel(talk_factory, sessions, workers)
+    else:
+        talks = talk_factory.create_many(sessions)
+
+    return ScheduledTalks(
+        talks, talk_factory.speaker_factory.speaker_to_talks()
+    )
+
+
+def load_data_from_stream(stream):
+    """レスポンスを逐次パースしてdataを組み立てる
+
+    タイムテーブルに載せないsessionはパースした端から捨てる。
+    """
+    # 空配列のキーも後段で参照するので、あらかじめ用意しておく
+    data = {
+        key: []
+        for key in ("sessions", "speakers", "questions", "categories", "rooms")
+    }
+    for key, item in iter_sections(stream):
+        if key == "sessions" and not is_included(item["title"]):
+            continue
+        data.setdefault(key, []).append(item)
+    return data
+
+
+def create_talks_from_stream(stream, question_titles=None):
+    return create_talks_from_data(
+        load_data_from_stream(stream), question_titles=question_titles
+    )
+
+
+def load_talks_from_snapshot(path, url=None, question_titles=None):
+    """保存済みのスナップショットからトークを作る。ネットワークにはアクセスしない"""
+    talks_list = []
+    for snapshot in resolve_snapshots(path, url):
+        with open_snapshot(snapshot) as stream:
+            talks_list.append(
+                create_talks_from_stream(stream, question_titles)
+            )
+    return ScheduledTalks.concatenate(talks_list)
+
+
+def fetch_talks(
+    url,
+    cache=None,
+    stream=False,
+    transport=None,
+    snapshot=None,
+    record=None,
+    question_titles=None,
+):
+    """question_titlesはQuestionAnswerFactoryに渡す（年ごとに質問のタイトルが違う場合）"""
+    if snapshot is not None:
+        return load_talks_from_snapshot(snapshot, url, question_titles)
+    if stream:
+        if cache is not None or record is not None:
+            raise ValueError("stream cannot be combined with cache or record")
+        with (transport or default_transport).open(url) as res:
+            return create_talks_from_stream(res, question_titles)
+    data = fetch_data(url, cache, transport, record)
+    return create_talks_from_data(data, question_titles=question_titles)
+
+
+@contextmanager
+def _thread_pool(max_workers):
+    executor = ThreadPoolExecutor(max_workers)
+    try:
+        yield executor
+    finally:
+        # 打ち切った取得のスレッドは、Transportのtimeoutで終わるのに任せる
+        executor.shutdown(wait=False)
+
+
+def _fetch_talks_and_close(url, cache, transport):
+    # 打ち切られた後でも、取得を終えたスレッドで接続を閉じる
+    try:
+        return fetch_talks(url, cache, transport=transport)
+    finally:
+        transport.close()
+
+
+async def fetch_talks_async(
+    url, cache=None, timeout=None, executor=None, transport=None
+):
+    """fetch_talksをスレッドプールで実行し、timeout秒で打ち切る
+
+    wait_forが打ち切ってもスレッドは止められないので、
+    transportを省略すると通信にもtimeoutを設定したTransportを作り、スレッドが残り続けないようにする。
+    作ったTransportは、取得を終えたスレッドで閉じる。
+    executorを省略すると専用のスレッドプールを作り、終わりを待たずに閉じる
+    （asyncio.runの既定のexecutorだと、打ち切った後もスレッドの終わりを待ってしまう）。
+    """
+    if executor is None:
+        with _thread_pool(1) as executor:
+            return await fetch_talks_async(
+                url, cache, timeout, executor, transport
+            )
+    if transport is None and timeout is not None:
+        func = partial(
+            _fetch_talks_and_close, url, cache, Transport(timeout=timeout)
+        )
+    else:
+        func = partial(fetch_talks, url, cache, transport=transport)
+    loop = asyncio.get_running_loop()
+    return await asyncio.wait_for(
+        loop.run_in_executor(executor, func), timeout
+    )
+
+
+async def fetch_many(endpoint_ids, concurrency=4, timeout=None, cache=None):
+    """複数のエンドポイントを並行して取得し、1つのScheduledTalksにまとめる
+
+    同時に取得するのはconcurrency個まで。トークの並びはendpoint_idsの順を保つ。
+    timeoutを指定すると、取得ごとにfetch_talks_asyncがTransportを作って閉じる。
+    """
+    semaphore = asyncio.Semaphore(concurrency)
 
+    async def fetch(endpoint_id):
+        async with semaphore:
+            return await fetch_talks_async(
+                sessionize_url(endpoint_id), cache, timeout, executor
+            )
 
-def fetch_talks(url):
-    data = fetch_data(url)
-    return create_talks_from_data(data)
+    with _thread_pool(concurrency) as executor:
+        results = await asyncio.gather(*(fetch(i) for i in endpoint_ids))
+    return ScheduledTalks.concatenate(results)
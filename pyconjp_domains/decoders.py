@@ -0,0 +1,40 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+BACKEND_NAMES = ("orjson", "ujson", "json")
+
+
+def available_backends():
+    backends = {}
+    if orjson is not None:
+        backends["orjson"] = orjson.loads
+    if ujson is not None:
+        backends["ujson"] = ujson.loads
+    backends["json"] = json.loads
+    return backends
+
+
+def get_decoder(name=None):
+    """バイト列（またはstr）をパースする関数を返す
+
+    nameを省略すると、インストールされているものをorjson, ujson, jsonの順で選ぶ。
+    どのバックエンドもdict / list / str / int / float / bool / Noneを返す。
+    """
+    backends = available_backends()
+    if name is None:
+        return next(backends[n] for n in BACKEND_NAMES if n in backends)
+    if name not in backends:
+        raise ValueError(f"JSON backend {name!r} is not available")
+    return backends[name]
+
+
+loads = get_decoder()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+try:
+    popcount = int.bit_count
+except AttributeError:  # Python 3.9以前
+
+    def popcount(bits: int) -> int:
+        return bin(bits).count("1")
+
+
+def bits_from_positions(positions, size: int) -> int:
+    """positionsのビットを立てた整数（ビットセット）"""
+    buffer = bytearray((size + 7) // 8)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def positions_from_bits(bits: int) -> list[int]:
+    """ビットセットで立っているビットの位置を昇順で返す"""
+    digits = bin(bits)[:1:-1]
+    positions = []
+    position = digits.find("1")
+    while position != -1:
+        positions.append(position)
+        position = digits.find("1", position + 1)
+    return positions
+
+
+class FacetIndex:
+    """facetの値ごとに、その値を持つトークの位置のビットを立てた整数を持つ
+
+    値はcategorical.pyの表の符号で引く。カテゴリのないトークの符号は-1。
+    """
+
+    FACETS = ("track", "level", "speaking_language", "slide_language")
+
+    def __init__(self, talks):
+        self.size = len(talks)
+        self.all = (1 << self.size) - 1
+        self.bitsets = {}
+        # 値ごとのトークの数。絞り込みの順番を決めるのに使う
+        self.counts = {}
+        for facet in self.FACETS:
+            attribute = f"{facet}_code"
+            # Categoryは多くのトークで共有されるので、インスタンスごとに1度だけ符号を引く
+            category_id_to_code = {}
+            code_to_positions = defaultdict(list)
+            for position, talk in enumerate(talks):
+                category = talk.category
+                if category is None:
+                    code = -1
+                else:
+                    code = category_id_to_code.get(id(category))
+                    if code is None:
+                        code = category_id_to_code[id(category)] = getattr(
+                            category, attribute
+                        )
+                code_to_positions[code].append(position)
+            self.bitsets[facet] = {
+                code: bits_from_positions(positions, self.size)
+                for code, positions in code_to_positions.items()
+            }
+            self.counts[facet] = {
+                code: len(positions)
+                for code, positions in code_to_positions.items()
+            }
+
+    def count(self, facet: str, codes) -> int:
+        """facetの値がcodesのどれかであるトークの数"""
+        counts = self.counts[facet]
+        return sum(counts.get(code, 0) for code in codes)
+
+    def union(self, facet: str, codes) -> int:
+        """facetの値がcodesのどれかであるトークのビットセット"""
+        bitsets = self.bitsets[facet]
+        bits = 0
+        for code in codes:
+            bits |= bitsets.get(code, 0)
+        return bits
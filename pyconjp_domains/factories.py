@@ -1,38 +1,59 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from datetime import date, datetime
+from dataclasses import fields
+from datetime import date
 
-from pyconjp_domains.constants import SESSIONIZE_DATETIME_FORMAT
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from pyconjp_domains.categorical import LANGUAGES, LEVELS, ROOMS, TRACKS
 from pyconjp_domains.talks import (
     Category,
+    LazyScheduledTalk,
     QuestionAnswer,
     ScheduledTalk,
     Slot,
     Speaker,
 )
+from pyconjp_domains.timestamps import parse_sessionize_datetime
+
+# Categoryの各フィールドに対応するsessionizeのカテゴリのタイトル（Categoryの引数の順）
+CATEGORY_TITLES = (
+    "Track",
+    "Level",
+    "Language",
+    "発表資料の言語 / Language of presentation material",
+)
+# Categoryの各フィールドの値を登録する表（CATEGORY_TITLESと同じ順）
+CATEGORY_TABLES = (TRACKS, LEVELS, LANGUAGES, LANGUAGES)
 
 
 class CategoryFactory:
     def __init__(self, item_id_to_category_title, item_id_to_name):
         self._item_id_to_category_title = item_id_to_category_title
         self._item_id_to_name = item_id_to_name
+        self._item_id_to_field = self._create_item_id_to_field_map(
+            item_id_to_category_title, item_id_to_name
+        )
+        self._categories = {}
 
     def create(self, values: list[int], is_plenary: bool) -> Category:
-        track, level = None, None
-        speaking_language, slide_language = None, None
-        for value in values:
-            category = self._item_id_to_category_title[value]
-            if category == "Track":
-                track = self._item_id_to_name[value]
-            elif category == "Level":
-                level = self._item_id_to_name[value]
-            elif category == "Language":
-                speaking_language = self._item_id_to_name[value]
-            elif category == "発表資料の言語 / Language of presentation material":
-                slide_language = self._item_id_to_name[value]
-        level = "All" if is_plenary else level
-        return Category(track, level, speaking_language, slide_language)
+        """同じ組合せのvaluesには同じCategoryのインスタンスを返す（変更しないこと）"""
+        key = (tuple(values), is_plenary)
+        category = self._categories.get(key)
+        if category is None:
+            fields = [None, None, None, None]
+            for value in values:
+                index, name = self._item_id_to_field[value]
+                if index is not None:
+                    fields[index] = name
+            if is_plenary:
+                fields[1] = "All"
+            category = self._categories[key] = Category(*fields)
+        return category
 
     @classmethod
     def from_(cls, categories_raw_data):
@@ -58,32 +79,75 @@ class CategoryFactory:
             for item in d["items"]
         }
 
+    @staticmethod
+    def _create_item_id_to_field_map(
+        item_id_to_category_title, item_id_to_name
+    ):
+        """item_idから (Categoryの引数の位置, 値) を引く表。対象外のカテゴリは位置がNone
+
+        値はCATEGORY_TABLESの表に登録しておく。
+        """
+        title_to_index = {title: i for i, title in enumerate(CATEGORY_TITLES)}
+        item_id_to_field = {}
+        for item_id, title in item_id_to_category_title.items():
+            index = title_to_index.get(title)
+            name = item_id_to_name[item_id]
+            if index is not None:
+                name = CATEGORY_TABLES[index].intern(name)
+            item_id_to_field[item_id] = (index, name)
+        return item_id_to_field
+
+
+# QuestionAnswerのフィールド名から、対応するsessionizeの質問のタイトルへの対応
+QUESTION_TITLES = {
+    "elevator_pitch": "Elevator Pitch",
+    "audience_prior_knowledge": "オーディエンスに求める前提知識",
+    "audience_take_away": "オーディエンスが持って帰れる具体的な知識やノウハウ",
+}
+
 
 class QuestionAnswerFactory:
-    def __init__(self, question_value_to_id_map):
+    def __init__(self, question_value_to_id_map, question_titles=None):
+        """question_titlesでQuestionAnswerのフィールドに対応する質問のタイトルを変えられる
+
+        question_titlesにないフィールドはQUESTION_TITLESのタイトルを使う。
+        """
         self._question_value_to_id_map = question_value_to_id_map
+        self._question_id_to_index = self._create_question_id_to_index_map(
+            question_value_to_id_map,
+            {**QUESTION_TITLES, **(question_titles or {})},
+        )
 
     def create(self, question_answers_data) -> QuestionAnswer:
-        question_id_to_answer_map = {
-            d["questionId"]: d["answerValue"] for d in question_answers_data
-        }
-        elevator_pitch = question_id_to_answer_map.get(
-            self._question_value_to_id_map["Elevator Pitch"]
-        )
-        prior_knowledge = question_id_to_answer_map.get(
-            self._question_value_to_id_map["オーディエンスに求める前提知識"]
-        )
-        take_away = question_id_to_answer_map.get(
-            self._question_value_to_id_map["オーディエンスが持って帰れる具体的な知識やノウハウ"]
-        )
-        return QuestionAnswer(elevator_pitch, prior_knowledge, take_away)
+        answers = [None, None, None]
+        for d in question_answers_data:
+            index = self._question_id_to_index.get(d["questionId"])
+            if index is not None:
+                answers[index] = d["answerValue"]
+        return QuestionAnswer(*answers)
 
     @classmethod
-    def from_(cls, questions_raw_data) -> QuestionAnswerFactory:
+    def from_(
+        cls, questions_raw_data, question_titles=None
+    ) -> QuestionAnswerFactory:
         question_value_to_id_map = {
             d["question"]: d["id"] for d in questions_raw_data
         }
-        return cls(question_value_to_id_map)
+        return cls(question_value_to_id_map, question_titles)
+
+    @staticmethod
+    def _create_question_id_to_index_map(
+        question_value_to_id_map, question_titles
+    ):
+        """questionIdから、QuestionAnswerの引数の位置を引く表"""
+        question_id_to_index = {}
+        for index, field in enumerate(fields(QuestionAnswer)):
+            question_id = question_value_to_id_map.get(
+                question_titles[field.name]
+            )
+            if question_id is not None:
+                question_id_to_index[question_id] = index
+        return question_id_to_index
 
 
 class SlotFactory:
@@ -99,6 +163,25 @@ class SlotFactory:
             self._starts_at_to_slot_number.get(starts_at, 0),
         )
 
+    def create_many(
+        self, starts_at_strings: list[str], room_ids: list[int]
+    ) -> list[Slot]:
+        """createを列ごとにまとめて行う。開始時刻は異なる文字列ごとに1回だけ解決する"""
+        starts_at_to_day_and_time = {}
+        for starts_at in starts_at_strings:
+            if starts_at not in starts_at_to_day_and_time:
+                start_datetime = parse_sessionize_datetime(starts_at)
+                starts_at_to_day_and_time[starts_at] = (
+                    start_datetime.date(),
+                    start_datetime.time(),
+                    self._starts_at_to_slot_number.get(starts_at, 0),
+                )
+        rooms = [self._room_id_to_name[room_id] for room_id in room_ids]
+        return [
+            Slot(room, *starts_at_to_day_and_time[starts_at])
+            for room, starts_at in zip(rooms, starts_at_strings)
+        ]
+
     @classmethod
     def from_(cls, rooms_raw_data, starts_at_strings) -> SlotFactory:
         room_id_to_name = cls._create_room_id_to_name_map(rooms_raw_data)
@@ -109,11 +192,11 @@ class SlotFactory:
 
     @staticmethod
     def date_from_string(string: str) -> date:
-        return datetime.strptime(string, SESSIONIZE_DATETIME_FORMAT).date()
+        return parse_sessionize_datetime(string).date()
 
     @staticmethod
     def _create_room_id_to_name_map(rooms_raw_data):
-        return {d["id"]: d["name"] for d in rooms_raw_data}
+        return {d["id"]: ROOMS.intern(d["name"]) for d in rooms_raw_data}
 
     @staticmethod
     def _create_datetime_string_to_slot_number_map(datetime_strings):
@@ -138,17 +221,44 @@ class SlotFactory:
 
 
 class SpeakerFactory:
-    def __init__(self, id_to_raw_data_map):
+    def __init__(self, id_to_raw_data_map, id_to_speaker=None):
+        """id_to_speakerに含まれるIDには、createでそのSpeakerを返す（前回作ったものの再利用）"""
         self._id_to_raw_data_map = id_to_raw_data_map
+        self._id_to_speaker = dict(id_to_speaker or {})
+        self._id_to_talks = defaultdict(list)
 
     def create(self, speaker_id: str) -> Speaker:
-        speaker_data = self._id_to_raw_data_map[speaker_id]
-        return Speaker(speaker_data["fullName"], speaker_data["bio"])
+        """同じspeaker_idには同じSpeakerのインスタンスを返す（変更しないこと）"""
+        speaker = self._id_to_speaker.get(speaker_id)
+        if speaker is None:
+            speaker_data = self._id_to_raw_data_map[speaker_id]
+            speaker = self._id_to_speaker[speaker_id] = Speaker(
+                speaker_data["fullName"], speaker_data["bio"]
+            )
+        return speaker
+
+    def register_talk(self, speaker_id: str, talk) -> None:
+        self._id_to_talks[speaker_id].append(talk)
+
+    def talks_of(self, speaker_id: str) -> list:
+        """スピーカーが登壇するトーク（ScheduledTalkFactoryで作った順）"""
+        return list(self._id_to_talks.get(speaker_id, []))
+
+    def speaker_to_talks(self) -> dict[str, list]:
+        """スピーカーのIDから、talks_ofのリストを引く辞書"""
+        return {
+            speaker_id: list(talks)
+            for speaker_id, talks in self._id_to_talks.items()
+        }
+
+    def id_to_speaker(self) -> dict[str, Speaker]:
+        """これまでに作ったSpeaker"""
+        return dict(self._id_to_speaker)
 
     @classmethod
-    def from_(cls, speakers_raw_data) -> SpeakerFactory:
+    def from_(cls, speakers_raw_data, id_to_speaker=None) -> SpeakerFactory:
         id_to_raw_data_map = {data["id"]: data for data in speakers_raw_data}
-        return cls(id_to_raw_data_map)
+        return cls(id_to_raw_data_map, id_to_speaker)
 
 
 class ScheduledTalkFactory:
@@ -166,50 +276,146 @@ class ScheduledTalkFactory:
 
     @staticmethod
     def calculate_duration_min(start: str, end: str) -> int:
-        start_datetime = datetime.strptime(start, SESSIONIZE_DATETIME_FORMAT)
-        end_datetime = datetime.strptime(end, SESSIONIZE_DATETIME_FORMAT)
+        start_datetime = parse_sessionize_datetime(start)
+        end_datetime = parse_sessionize_datetime(end)
         duration = end_datetime - start_datetime
         return duration.seconds // 60
 
-    def create(self, session) -> ScheduledTalk:
-        slot = self._slot_factory.create(
-            session["startsAt"], session["roomId"]
+    @staticmethod
+    def calculate_durations_min(
+        starts: list[str], ends: list[str], use_numpy: bool = False
+    ) -> list[int]:
+        """calculate_duration_minを列ごとにまとめて行う"""
+        if use_numpy:
+            # 1日を超える差はcalculate_duration_min (timedelta.seconds) と同様に切り捨てる
+            seconds = (
+                numpy.array(ends, dtype="datetime64[s]")
+                - numpy.array(starts, dtype="datetime64[s]")
+            ).astype("int64")
+            return ((seconds % 86400) // 60).tolist()
+        pair_to_duration = {}
+        durations = []
+        for pair in zip(starts, ends):
+            if pair not in pair_to_duration:
+                pair_to_duration[pair] = (
+                    ScheduledTalkFactory.calculate_duration_min(*pair)
+                )
+            durations.append(pair_to_duration[pair])
+        return durations
+
+    def create_many(
+        self, sessions, use_numpy: bool | None = None
+    ) -> list[ScheduledTalk]:
+        """sessionsをまとめてScheduledTalkにする
+
+        スロットと所要時間を列ごとにまとめて解決してから組み立てる。
+        use_numpyを省略すると、numpyがインストールされていてsessionsが多いときに使う。
+        """
+        if use_numpy is None:
+            use_numpy = numpy is not None and len(sessions) >= 256
+        starts = [session["startsAt"] for session in sessions]
+        slots = self._slot_factory.create_many(
+            starts, [session["roomId"] for session in sessions]
         )
-        duration_min = self.calculate_duration_min(
-            session["startsAt"], session["endsAt"]
+        durations = self.calculate_durations_min(
+            starts, [session["endsAt"] for session in sessions], use_numpy
         )
+
+        return [
+            self._assemble(session, slot, duration_min)
+            for session, slot, duration_min in zip(sessions, slots, durations)
+        ]
+
+    def create_lazy(self, session) -> LazyScheduledTalk:
+        """カテゴリ・回答・スピーカー・スロットを初めて参照したときに作るScheduledTalk"""
+        talk = LazyScheduledTalk(session, self)
+        self.register_talk(session, talk)
+        return talk
+
+    @staticmethod
+    def create_plain_fields(session) -> tuple:
+        """sessionの値をそのまま使うフィールド
+
+        (id, title, description, slide_url, recording_url) の順に返す。
+        """
         if session["isServiceSession"]:
-            return ScheduledTalk(
-                session["id"],
-                session["title"],
-                session["description"],
-                None,
-                None,
-                [],
-                slot,
-                duration_min,
-            )
+            slide_url, recording_url = None, None
+        else:
+            # Workaround: Use live URL as slide URL
+            slide_url = session["liveUrl"]
+            recording_url = session["recordingUrl"]
+        return (
+            session["id"],
+            session["title"],
+            session["description"],
+            slide_url,
+            recording_url,
+        )
 
-        category = self._category_factory.create(
+    def create_category(self, session) -> Category | None:
+        if session["isServiceSession"]:
+            return None
+        return self._category_factory.create(
             session["categoryItems"], session["isPlenumSession"]
         )
-        question_answer = self._question_answer_factory.create(
-            session["questionAnswers"]
-        )
-        speakers = [
+
+    def create_answer(self, session) -> QuestionAnswer | None:
+        if session["isServiceSession"]:
+            return None
+        return self._question_answer_factory.create(session["questionAnswers"])
+
+    def create_speakers(self, session) -> list[Speaker]:
+        if session["isServiceSession"]:
+            return []
+        return [
             self._speaker_factory.create(speaker_id)
             for speaker_id in session["speakers"]
         ]
-        return ScheduledTalk(
-            session["id"],
-            session["title"],
-            session["description"],
-            category,
-            question_answer,
-            speakers,
+
+    def create_slot(self, session) -> Slot:
+        return self._slot_factory.create(
+            session["startsAt"], session["roomId"]
+        )
+
+    def create_duration_min(self, session) -> int:
+        return self.calculate_duration_min(
+            session["startsAt"], session["endsAt"]
+        )
+
+    def create(self, session) -> ScheduledTalk:
+        return self._assemble(
+            session,
+            self.create_slot(session),
+            self.create_duration_min(session),
+        )
+
+    def _assemble(self, session, slot, duration_min):
+        """sessionをScheduledTalkにする。スロットと所要時間は呼び出し側で作る"""
+        id_, title, description, slide_url, recording_url = (
+            self.create_plain_fields(session)
+        )
+        talk = ScheduledTalk(
+            id_,
+            title,
+            description,
+            self.create_category(session),
+            self.create_answer(session),
+            self.create_speakers(session),
             slot,
             duration_min,
-            # Workaround: Use live URL as slide URL
-            session["liveUrl"],
-            session["recordingUrl"],
+            slide_url,
+            recording_url,
         )
+        self.register_talk(session, talk)
+        return talk
+
+    @property
+    def speaker_factory(self) -> SpeakerFactory:
+        return self._speaker_factory
+
+    def register_talk(self, session, talk) -> None:
+        """sessionのスピーカーからtalkを引けるようにする。createなどは作ったときに登録する"""
+        if session["isServiceSession"]:
+            return
+        for speaker_id in session["speakers"]:
+            self._speaker_factory.register_talk(speaker_id, talk)
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+
+def write_atomically(path, content: bytes) -> None:
+    """読み手が書き込み途中のファイルを見ないよう、一時ファイルに書いてから置き換える
+
+    一時ファイルの名前にはプロセスIDとスレッドIDを付け、同じパスへの同時の書き込みがぶつからないようにする。
+    """
+    path = Path(path)
+    tmp_path = path.with_name(
+        f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
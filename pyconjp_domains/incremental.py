@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from pyconjp_domains.core import (
+    _filter_with_modal_sessions,
+    create_talk_factory,
+    filter_sessions,
+)
+from pyconjp_domains.factories import SpeakerFactory
+from pyconjp_domains.talks import ScheduledTalks
+
+
+class IncrementalTalksBuilder:
+    """前回のbuildから変わったsessionだけScheduledTalkを作り直す
+
+    前回のdataのsessionとスピーカーを覚えておき、sessionもそのスピーカーも等しければ
+    前回のScheduledTalkをそのまま使う（ハッシュを取るより、辞書を直接比べる方が速い）。
+    categories / questions / rooms やスロット番号の割り振りが変わったら全て作り直す。
+    内容の変わらないスピーカーは、buildをまたいで同じSpeakerのインスタンスを使う。
+    buildに渡したdataは次のbuildで比べるので、変更しないこと。
+    """
+
+    def __init__(self):
+        self._context = None
+        self._session_id_to_entry = {}
+        self._speaker_id_to_data = {}
+        self._id_to_speaker = {}
+        # 直近のbuildで作り直したsessionの数
+        self.rebuilt_count = 0
+
+    def build(self, data) -> ScheduledTalks:
+        sessions = list(filter_sessions(data["sessions"]))
+
+        context = (
+            data["categories"],
+            data["questions"],
+            data["rooms"],
+            # スロット番号はモーダル表示するsessionの開始時刻の集合で決まる
+            {s["startsAt"] for s in _filter_with_modal_sessions(sessions)},
+        )
+        if context != self._context:
+            self._session_id_to_entry = {}
+        self._context = context
+
+        # 内容の変わらないスピーカーは前回のSpeakerを使い、1つのIDに1つのインスタンスを保つ
+        speaker_id_to_data = {
+            speaker["id"]: speaker for speaker in data["speakers"]
+        }
+        changed_speaker_ids = set()
+        reused_speakers = {}
+        for speaker_id, speaker_data in speaker_id_to_data.items():
+            if self._speaker_id_to_data.get(speaker_id) != speaker_data:
+                changed_speaker_ids.add(speaker_id)
+            elif speaker_id in self._id_to_speaker:
+                reused_speakers[speaker_id] = self._id_to_speaker[speaker_id]
+        speaker_factory = SpeakerFactory(speaker_id_to_data, reused_speakers)
+        talk_factory = None
+        session_id_to_entry = {}
+        talks = []
+        self.rebuilt_count = 0
+        for session in sessions:
+            entry = self._session_id_to_entry.get(session["id"])
+            if (
+                entry is not None
+                and entry[0] == session
+                and changed_speaker_ids.isdisjoint(session["speakers"])
+            ):
+                talk = entry[1]
+                # 作り直したトークと同じく、スピーカーから引けるようにする
+                if not session["isServiceSession"]:
+                    for speaker_id in session["speakers"]:
+                        speaker_factory.register_talk(speaker_id, talk)
+            else:
+                if talk_factory is None:
+                    talk_factory = create_talk_factory(
+                        data, sessions, speaker_factory=speaker_factory
+                    )
+                talk = talk_factory.create(session)
+                self.rebuilt_count += 1
+            session_id_to_entry[session["id"]] = (session, talk)
+            talks.append(talk)
+
+        self._session_id_to_entry = session_id_to_entry
+        self._speaker_id_to_data = speaker_id_to_data
+        self._id_to_speaker = speaker_factory.id_to_speaker()
+        return ScheduledTalks(talks, speaker_factory.speaker_to_talks())
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable
+
+# 絞り込みの方法ごとの1件あたりのおおよその重さ
+METHOD_COSTS = {
+    # ビットセットの論理積
+    "bitset": 0,
+    # 転置インデックスで候補を絞り、本文を確かめる
+    "index": 1,
+    # 残ったトークの本文を1件ずつ確かめる
+    "scan": 2,
+}
+
+
+@dataclass
+class Clause:
+    """filter_byのrequestの条件1つ"""
+
+    name: str
+    method: str
+    # 条件を満たすトークの数の見積もり
+    estimated_rows: int
+    # それまでに残ったトークのビットセットを受け取り、条件で絞り込んだビットセットを返す
+    apply: Callable[[int], int] = field(repr=False, compare=False)
+
+
+class QueryPlan:
+    """条件を軽い方法・絞り込める条件の順に並べて実行する"""
+
+    def __init__(self, clauses: list[Clause]):
+        self.steps = sorted(
+            clauses,
+            key=lambda c: (METHOD_COSTS[c.method], c.estimated_rows),
+        )
+
+    def execute(self, bits: int) -> int:
+        """bitsのトークを順に絞り込む。途中で1件も残らなくなったら打ち切る"""
+        for step in self.steps:
+            if not bits:
+                break
+            bits = step.apply(bits)
+        return bits
+
+    def explain(self) -> list[dict]:
+        """実行する順の条件と、その方法・見積もった件数"""
+        return [
+            {
+                "clause": step.name,
+                "method": step.method,
+                "estimated_rows": step.estimated_rows,
+            }
+            for step in self.steps
+        ]
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import heapq
+import math
+from array import array
+from collections import Counter, defaultdict
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from pyconjp_domains.search import normalize
+
+
+def terms_of(text: str) -> list[str]:
+    """正規化したtextを空白で区切り、それぞれの文字bigramを並べる（1文字の語はそのまま）"""
+    terms = []
+    for word in normalize(text).split():
+        if len(word) == 1:
+            terms.append(word)
+        else:
+            terms.extend(
+                word[start:end]
+                for start, end in enumerate(range(2, len(word) + 1))
+            )
+    return terms
+
+
+class BM25Index:
+    """文字bigramを語とするBM25のインデックス
+
+    語ごとに、その語を含む文書の位置と、その文書でのスコアへの寄与を作るときに計算しておく。
+    検索ではクエリの語のポスティングリストの寄与を足し合わせるだけにする。
+    """
+
+    def __init__(self, texts, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        term_to_frequencies = defaultdict(list)
+        lengths = []
+        for position, text in enumerate(texts):
+            terms = terms_of(text)
+            lengths.append(len(terms))
+            for term, frequency in Counter(terms).items():
+                term_to_frequencies[term].append((position, frequency))
+        self.size = len(lengths)
+
+        # 語が1つもないときに0で割らないようにする
+        average_length = sum(lengths) / max(self.size, 1) or 1.0
+        # tfの補正の分母の項 k1 * (1 - b + b * 長さ / 平均の長さ)
+        length_norms = [
+            k1 * (1 - b + b * length / average_length) for length in lengths
+        ]
+        self._postings = {}
+        for term, frequencies in term_to_frequencies.items():
+            document_frequency = len(frequencies)
+            idf = math.log(
+                1
+                + (self.size - document_frequency + 0.5)
+                / (document_frequency + 0.5)
+            )
+            self._postings[term] = (
+                array("i", [position for position, _ in frequencies]),
+                array(
+                    "d",
+                    [
+                        idf
+                        * frequency
+                        * (k1 + 1)
+                        / (frequency + length_norms[position])
+                        for position, frequency in frequencies
+                    ],
+                ),
+            )
+
+    def _postings_of(self, query):
+        terms = set(terms_of(query))
+        return [
+            self._postings[term] for term in terms if term in self._postings
+        ]
+
+    def scores(self, query: str) -> dict[int, float]:
+        """queryの語を1つ以上含む文書の位置から、スコアを引く辞書"""
+        scores = defaultdict(float)
+        for positions, weights in self._postings_of(query):
+            for position, weight in zip(positions, weights):
+                scores[position] += weight
+        return scores
+
+    def top_k(
+        self, query: str, k: int, use_numpy: bool | None = None
+    ) -> list[tuple[int, float]]:
+        """スコアの高い順にk件の (文書の位置, スコア)。同じスコアなら位置の小さい順
+
+        全件は並べ替えず、上位k件だけを取り出す。
+        use_numpyを省略すると、numpyがインストールされていて文書が多いときに使う。
+        kが0以下なら空のリストを返す。
+        """
+        if k <= 0:
+            return []
+        if use_numpy is None:
+            use_numpy = numpy is not None and self.size >= 256
+        if use_numpy:
+            return self._top_k_with_numpy(query, k)
+        return heapq.nlargest(
+            k, self.scores(query).items(), key=lambda item: (item[1], -item[0])
+        )
+
+    def _top_k_with_numpy(self, query, k):
+        scores = numpy.zeros(self.size)
+        for positions, weights in self._postings_of(query):
+            # 1つの語のポスティングリストに同じ位置は1度しか現れない
+            scores[
+                numpy.frombuffer(positions, dtype=numpy.intc)
+            ] += numpy.frombuffer(weights)
+        matched = numpy.flatnonzero(scores)
+        if len(matched) > k:
+            # k番目のスコア以上の文書だけを残す（同じスコアの文書は全て残る）
+            threshold = numpy.partition(scores[matched], -k)[-k]
+            matched = matched[scores[matched] >= threshold]
+        top = sorted(
+            matched.tolist(),
+            key=lambda position: (-scores[position], position),
+        )[:k]
+        return [(position, float(scores[position])) for position in top]
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import unicodedata
+from array import array
+from collections import defaultdict
+
+
+def normalize(text: str) -> str:
+    """全角・半角の違いをNFKCでそろえてからcasefoldする"""
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def ngrams(text: str, n: int) -> set[str]:
+    """textに含まれるn文字の断片の集合"""
+    return {
+        text[start:end] for start, end in enumerate(range(n, len(text) + 1))
+    }
+
+
+class NgramIndex:
+    """文字n-gramの転置インデックス。キーワードを部分文字列として含む文書を探す
+
+    文書ごとに、含まれる1文字とn文字の断片を登録する。
+    n文字以上のキーワードはn-gramの、短いキーワードは1文字のポスティングリストの積を
+    短いものから順に取って候補を絞り、最後に候補の本文にキーワードが含まれるか確かめる。
+    """
+
+    def __init__(self, texts, n: int = 3):
+        self.n = n
+        self._texts = list(texts)
+        postings = defaultdict(lambda: array("i"))
+        for position, text in enumerate(self._texts):
+            for gram in self._grams_of_text(text):
+                postings[gram].append(position)
+        self._postings = dict(postings)
+
+    def __len__(self):
+        return len(self._texts)
+
+    def _grams_of_text(self, text):
+        return set(text) | ngrams(text, self.n)
+
+    def _grams_of_keyword(self, keyword):
+        if len(keyword) < self.n:
+            return set(keyword)
+        return ngrams(keyword, self.n)
+
+    def _postings_of(self, keywords):
+        """キーワードのn-gram（または1文字）のポスティングリスト。索引にない断片があればNone"""
+        grams = set()
+        for keyword in keywords:
+            grams.update(self._grams_of_keyword(keyword))
+        postings = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                return None
+            postings.append(posting)
+        return postings
+
+    def estimate(self, keywords) -> int:
+        """searchが返す文書の数の上限（最も短いポスティングリストの長さ）"""
+        postings = self._postings_of(keywords)
+        if postings is None:
+            return 0
+        return min(map(len, postings), default=len(self._texts))
+
+    def search(self, keywords, candidates=None) -> list[int]:
+        """全てのキーワードを含む文書の位置を昇順で返す（AND検索）
+
+        candidates（文書の位置）を渡すと、その中からだけ探す。
+        """
+        keywords = list(keywords)
+        postings = self._postings_of(keywords)
+        if postings is None:
+            return []
+
+        postings.sort(key=len)
+        if candidates is not None:
+            candidates = set(candidates)
+        elif postings:
+            candidates = set(postings.pop(0))
+        for posting in postings:
+            # 候補が十分に少なくなったら、残りは本文で確かめる方が速い
+            if len(posting) > 16 * len(candidates):
+                break
+            candidates.intersection_update(posting)
+        if candidates is None:
+            # 空文字列のキーワードしかないときは全ての文書が候補
+            candidates = range(len(self._texts))
+        else:
+            candidates = sorted(candidates)
+
+        texts = self._texts
+        return [
+            position
+            for position in candidates
+            if all(keyword in texts[position] for keyword in keywords)
+        ]
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import re
+from contextlib import contextmanager
+from pathlib import Path
+
+from pyconjp_domains.files import write_atomically
+
+_SESSIONIZE_URL_PATTERN = re.compile(r"/api/v2/([^/]+)/view/All")
+
+
+def snapshot_name(url: str) -> str:
+    """URLに対応するスナップショットのファイル名（sessionizeならエンドポイントID）"""
+    match = _SESSIONIZE_URL_PATTERN.search(url)
+    if match:
+        return f"{match.group(1)}.json"
+    return f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+
+def resolve_snapshots(path, url: str | None = None) -> list[Path]:
+    """スナップショットのファイルを返す
+
+    pathがディレクトリの場合、urlを指定すればそのURLのファイルを、
+    指定しなければディレクトリ内の全ての *.json をファイル名順に返す。
+    """
+    path = Path(path)
+    if not path.is_dir():
+        return [path]
+    if url is not None:
+        return [path / snapshot_name(url)]
+    return sorted(path.glob("*.json"))
+
+
+@contextmanager
+def open_snapshot(path):
+    """スナップショットをmmapで開く。Pythonのバッファにファイル全体をコピーしない"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"Empty snapshot: {path}")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def save_snapshot(path, url: str, body: bytes) -> Path:
+    """レスポンスのボディをそのまま保存する。pathが既存のディレクトリならURLから名前を決める"""
+    path = Path(path)
+    if path.is_dir():
+        path = path / snapshot_name(url)
+    write_atomically(path, body)
+    return path
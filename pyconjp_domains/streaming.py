@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import codecs
+import json
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    """バイト列のストリームを少しずつ読み、デコード済みの文字列をバッファする"""
+
+    def __init__(self, stream, chunk_size):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def fill(self, size=None):
+        """読み終えた部分を捨て、ストリームから読み足す。読めたらTrue"""
+        if self.eof:
+            return False
+        chunk = self._stream.read(size or self._chunk_size)
+        self.buffer = self.buffer[self.position :] + self._decoder.decode(
+            chunk, final=not chunk
+        )
+        self.position = 0
+        if not chunk:
+            self.eof = True
+        return True
+
+    def peek(self):
+        """空白を読み飛ばし、次の1文字を返す（読み進めない）"""
+        while True:
+            while (
+                self.position < len(self.buffer)
+                and self.buffer[self.position] in _WHITESPACE
+            ):
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(
+                f"Expected {char!r} at {self.position}: "
+                f"{self.buffer[self.position:self.position + 20]!r}"
+            )
+        self.position += 1
+
+    def decode_value(self):
+        """次のJSONの値を1つデコードする。値が途中で切れていたら読み足して再試行"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                # 大きな値でも読み直しが線形に収まるよう、読み足す量を倍々にする
+                if not self.fill(max(self._chunk_size, len(self.buffer))):
+                    raise
+                continue
+            # 数値がチャンクの境目で切れている可能性があるので、末尾なら読み足す
+            if end == len(self.buffer) and not self.eof:
+                self.fill()
+                continue
+            self.position = end
+            return value
+
+
+def iter_sections(stream, chunk_size: int = 64 * 1024):
+    """トップレベルのJSONオブジェクトを先頭から読み、(キー, 要素) を順に返す
+
+    値が配列のキーは要素を1つずつ返す。配列以外の値はそのまま1回だけ返す。
+    ドキュメント全体を文字列としてメモリに載せずにパースできる。
+    """
+    reader = _Reader(stream, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.decode_value()
+        reader.expect(":")
+        if reader.peek() == "[":
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.position += 1
+            else:
+                while True:
+                    yield key, reader.decode_value()
+                    if reader.peek() == "]":
+                        reader.position += 1
+                        break
+                    reader.expect(",")
+        else:
+            yield key, reader.decode_value()
+        if reader.peek() == "}":
+            return
+        reader.expect(",")
@@ -1,10 +1,60 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
-from dataclasses import dataclass
-from datetime import date, datetime, time
-
-from pyconjp_domains.constants import SESSIONIZE_DATETIME_FORMAT
+from dataclasses import MISSING, dataclass, field, fields
+from datetime import date, time
+from functools import wraps
+
+from pyconjp_domains.categorical import LANGUAGES, LEVELS, ROOMS, TRACKS
+from pyconjp_domains.facets import (
+    FacetIndex,
+    bits_from_positions,
+    popcount,
+    positions_from_bits,
+)
+from pyconjp_domains.planner import Clause, QueryPlan
+from pyconjp_domains.ranking import BM25Index
+from pyconjp_domains.search import NgramIndex, normalize
+from pyconjp_domains.timestamps import parse_sessionize_datetime
+
+
+def slotted(cls):
+    """dataclassを__slots__付きで作り直す（Python 3.10のdataclass(slots=True)相当）
+
+    インスタンスごとの__dict__がなくなり、フィールドの多いトークを大量に持つときのメモリが減る。
+    """
+    field_names = tuple(f.name for f in fields(cls))
+    inherited = set()
+    for base in cls.__mro__[1:-1]:
+        inherited.update(getattr(base, "__slots__", ()))
+    cls_dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = tuple(
+        name for name in field_names if name not in inherited
+    )
+    # デフォルト値のクラス属性はスロットと衝突する。__init__はデフォルト値を別に持っている
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    # init=Falseのフィールドのデフォルト値は、__init__ではなくクラス属性から読まれていた
+    init_defaults = [
+        (f.name, f.default)
+        for f in fields(cls)
+        if not f.init and f.default is not MISSING
+    ]
+    if init_defaults:
+        init = cls_dict["__init__"]
+
+        @wraps(init)
+        def __init__(self, *args, **kwargs):
+            for name, default in init_defaults:
+                setattr(self, name, default)
+            init(self, *args, **kwargs)
+
+        cls_dict["__init__"] = __init__
+    new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    new_cls.__qualname__ = cls.__qualname__
+    return new_cls
 
 
 def get_single_choice_category_value(category: dict) -> str:
@@ -12,12 +62,14 @@ def get_single_choice_category_value(category: dict) -> str:
     return category["categoryItems"][0]["name"]
 
 
+@slotted
 @dataclass
 class Speaker:
     name: str
     profile: str | None = None
 
 
+@slotted
 @dataclass
 class Category:
     track: str | None
@@ -25,6 +77,43 @@ class Category:
     speaking_language: str | None
     slide_language: str | None
 
+    def __post_init__(self):
+        # 同じ値の文字列は表に登録したインスタンスを共有する
+        self.track = TRACKS.intern(self.track)
+        self.level = LEVELS.intern(self.level)
+        self.speaking_language = LANGUAGES.intern(self.speaking_language)
+        self.slide_language = LANGUAGES.intern(self.slide_language)
+
+    # categorical.pyの表の符号。絞り込みでは文字列ではなく符号同士を比較する
+    # フィールドを変更しても古い符号が残らないよう、参照するたびに今の値から引く
+    @property
+    def track_code(self) -> int:
+        return TRACKS.encode(self.track)
+
+    @property
+    def level_code(self) -> int:
+        return LEVELS.encode(self.level)
+
+    @property
+    def speaking_language_code(self) -> int:
+        return LANGUAGES.encode(self.speaking_language)
+
+    @property
+    def slide_language_code(self) -> int:
+        return LANGUAGES.encode(self.slide_language)
+
+    def __reduce__(self):
+        # unpickleしたプロセスでも、文字列はそのプロセスの表のインスタンスを共有する
+        return (
+            self.__class__,
+            (
+                self.track,
+                self.level,
+                self.speaking_language,
+                self.slide_language,
+            ),
+        )
+
     @staticmethod
     def flatten_raw_json(categories: list[dict]) -> dict[str, str]:
         """sessionizeのAPIの返り値のうち、ネストしたcategoriesフィールドをパースして平坦にする"""
@@ -56,6 +145,7 @@ class Category:
         return cls(**cls.flatten_raw_json(categories))
 
 
+@slotted
 @dataclass
 class QuestionAnswer:
     elevator_pitch: str | None
@@ -85,6 +175,7 @@ class QuestionAnswer:
         return cls(**cls.flatten_raw_json(question_answers))
 
 
+@slotted
 @dataclass
 class Talk:
     id: int | str
@@ -93,6 +184,9 @@ class Talk:
     category: Category | None
     answer: QuestionAnswer | None
     speakers: list[Speaker]
+    _search_text: str | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @property
     def track(self):
@@ -130,6 +224,41 @@ class Talk:
     def speaker_profiles(self):
         return [speaker.profile for speaker in self.speakers]
 
+    @property
+    def search_text(self) -> str:
+        """filter_byのキーワード検索の対象をcasefoldしたもの
+
+        タイトル・エレベータピッチ・前提知識・持ち帰れるもの（詳細は使っていない）。Noneの項目は飛ばす。
+        初めて参照したときに作って保持する（それ以降にフィールドを変更しても作り直さない）。
+        """
+        if self._search_text is None:
+            values = [
+                self.title,
+                self.elevator_pitch,
+                self.prior_knowledge,
+                self.take_away,
+            ]
+            self._search_text = "\n".join(
+                value for value in values if value is not None
+            ).casefold()
+        return self._search_text
+
+    @property
+    def full_text(self) -> str:
+        """全文検索の対象を正規化したもの（保持はしない）
+
+        search_textの項目に加えて、詳細とスピーカーの名前。
+        """
+        values = [
+            self.title,
+            self.elevator_pitch,
+            self.prior_knowledge,
+            self.take_away,
+            self.description,
+            *self.speaker_names,
+        ]
+        return normalize("\n".join(value for value in values if value))
+
     def as_list(self, fields):
         return [getattr(self, field) for field in fields]
 
@@ -137,6 +266,27 @@ class Talk:
 @dataclass
 class Talks(Sequence):
     talks: list[Talk]
+    # キーワード検索の転置インデックス。2度目にキーワードで絞り込むときに作る
+    _keyword_index: NgramIndex | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # filter_by / facet_countsでキーワードで絞り込んだ回数。
+    # 1度目はインデックスを作らずに本文を走査する（explainは数えない）
+    _keyword_queries: int = field(
+        default=0, init=False, repr=False, compare=False
+    )
+    # 全文検索の文字bigramの転置インデックス。初めて全文検索するときに作る
+    _full_text_index: NgramIndex | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # 順位付き検索のBM25のインデックス。初めて順位付きで検索するときに作る
+    _ranking_index: BM25Index | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # track / level / 言語の値ごとのビットセット。初めて絞り込むときに作る
+    _facet_index: FacetIndex | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __len__(self):
         return len(self.talks)
@@ -168,41 +318,219 @@ class Talks(Sequence):
             talks.append(talk)
         return cls(sorted(talks, key=lambda t: t.id))
 
-    def filter_by(self, request: dict) -> "Talks":
+    def keyword_index(self) -> NgramIndex:
+        """talksの並びに対応するキーワード検索のインデックス（talksは変更しないこと）"""
+        if self._keyword_index is None:
+            self._keyword_index = NgramIndex(
+                talk.search_text for talk in self.talks
+            )
+        return self._keyword_index
+
+    def full_text_index(self) -> NgramIndex:
+        """talksの並びに対応する全文検索のインデックス（talksは変更しないこと）"""
+        if self._full_text_index is None:
+            self._full_text_index = NgramIndex(
+                (talk.full_text for talk in self.talks), n=2
+            )
+        return self._full_text_index
+
+    def search_full_text(self, query: str) -> "Talks":
+        """queryを空白で区切った語を全て部分文字列として含むトーク（並び順は変えない）
+
+        語も本文もNFKCで正規化してcasefoldしてから比べるので、全角・半角や大文字・小文字の違いは無視する。
+        """
+        terms = normalize(query).split()
+        if not terms:
+            return self.__class__(list(self.talks))
+        talks = self.talks
+        return self.__class__(
+            [
+                talks[position]
+                for position in self.full_text_index().search(terms)
+            ]
+        )
+
+    def ranking_index(self) -> BM25Index:
+        """talksの並びに対応するBM25のインデックス（talksは変更しないこと）
+
+        タイトル・エレベータピッチ・持ち帰れるもの・詳細を対象にする。
+        """
+        if self._ranking_index is None:
+            self._ranking_index = BM25Index(
+                "\n".join(
+                    value
+                    for value in (
+                        talk.title,
+                        talk.elevator_pitch,
+                        talk.take_away,
+                        talk.description,
+                    )
+                    if value
+                )
+                for talk in self.talks
+            )
+        return self._ranking_index
+
+    def search(self, query: str, k: int = 10) -> "Talks":
+        """queryとの関連度（BM25）が高い順にk件のトーク
+
+        queryも本文もNFKCで正規化してcasefoldし、文字bigramを語として数える。
+        """
         talks = self.talks
+        return self.__class__(
+            [
+                talks[position]
+                for position, _ in self.ranking_index().top_k(query, k)
+            ]
+        )
+
+    def facet_index(self) -> FacetIndex:
+        """talksの並びに対応するfacetのビットセット（talksは変更しないこと）"""
+        if self._facet_index is None:
+            self._facet_index = FacetIndex(self.talks)
+        return self._facet_index
+
+    def plan(self, request: dict) -> QueryPlan:
+        """requestの条件を、軽くて絞り込める順に並べた実行計画
+
+        件数の見積もりには、facetの値ごとの件数とキーワードのポスティングリストの長さを使う。
+        """
+        facets = self.facet_index()
+        clauses = []
         if request["tracks"]:
-            talks = [t for t in talks if t.category.track in request["tracks"]]
+            track_codes = TRACKS.codes_of(request["tracks"])
+            clauses.append(
+                Clause(
+                    "tracks",
+                    "bitset",
+                    facets.count("track", track_codes),
+                    lambda bits: bits & facets.union("track", track_codes),
+                )
+            )
         if request["levels"]:
-            talks = [t for t in talks if t.category.level in request["levels"]]
+            level_codes = LEVELS.codes_of(request["levels"])
+            clauses.append(
+                Clause(
+                    "levels",
+                    "bitset",
+                    facets.count("level", level_codes),
+                    lambda bits: bits & facets.union("level", level_codes),
+                )
+            )
         if request["keywords"]:
-            # AND検索。case-insensitive。
-            # タイトル・エレベータピッチ・前提知識・持ち帰れるものの部分文字列か（詳細は使っていない）
-            for keyword in request["keywords"]:
-                talks = [
-                    t
-                    for t in talks
-                    if keyword
-                    in "\n".join(
-                        [
-                            t.title,
-                            t.answer.elevator_pitch,
-                            t.answer.audience_prior_knowledge,
-                            t.answer.audience_take_away,
-                        ]
-                    ).lower()
-                ]
+            # AND検索。キーワードもcasefoldして比べる
+            keywords = [keyword.casefold() for keyword in request["keywords"]]
+            # filter_byやスライスで作ったTalksは1度しか絞り込まないことが多く、
+            # インデックスを作るより、キャッシュしたsearch_textを走査する方が速い
+            if self._keyword_index is None and not self._keyword_queries:
+                clauses.append(self._keyword_scan_clause(keywords))
+            else:
+                clauses.append(
+                    self._keyword_index_clause(keywords, facets.size)
+                )
         if request["is_english_only"]:
-            talks = [
-                t
-                for t in talks
-                # speaking_language は Japanese / English
-                if t.category.speaking_language == "English"
-                # slide_language は Japanese only / English only / Both
-                or t.category.slide_language != "Japanese only"
+            # 表にない値の符号はNoneで、どのトークの符号とも一致しない
+            # speaking_language は Japanese / English
+            english = [LANGUAGES.code_of("English")]
+            # slide_language は Japanese only / English only / Both
+            japanese_only = [LANGUAGES.code_of("Japanese only")]
+            clauses.append(
+                Clause(
+                    "is_english_only",
+                    "bitset",
+                    min(
+                        facets.size,
+                        facets.count("speaking_language", english)
+                        + facets.size
+                        - facets.count("slide_language", japanese_only),
+                    ),
+                    lambda bits: bits
+                    & (
+                        facets.union("speaking_language", english)
+                        | ~facets.union("slide_language", japanese_only)
+                    ),
+                )
+            )
+        return QueryPlan(clauses)
+
+    def _keyword_scan_clause(self, keywords):
+        talks = self.talks
+
+        def apply_keywords(bits):
+            matched = [
+                position
+                for position in positions_from_bits(bits)
+                if all(
+                    keyword in talks[position].search_text
+                    for keyword in keywords
+                )
             ]
-        return self.__class__(talks)
+            return bits_from_positions(matched, len(talks))
+
+        return Clause("keywords", "scan", len(talks), apply_keywords)
+
+    def _keyword_index_clause(self, keywords, size):
+        index = self.keyword_index()
+        estimated_rows = index.estimate(keywords)
+
+        def apply_keywords(bits):
+            if popcount(bits) < estimated_rows:
+                # それまでの条件で残ったトークの本文だけを確かめる
+                positions = index.search(keywords, positions_from_bits(bits))
+            else:
+                positions = index.search(keywords)
+            return bits & bits_from_positions(positions, size)
+
+        return Clause("keywords", "index", estimated_rows, apply_keywords)
+
+    def explain(self, request: dict) -> list[dict]:
+        """filter_byが条件をどの順に、どの方法で適用するか"""
+        return self.plan(request).explain()
+
+    def filter_by(self, request: dict) -> "Talks":
+        bits = self.plan(request).execute(self.facet_index().all)
+        if request["keywords"]:
+            self._keyword_queries += 1
+        talks = self.talks
+        return self.__class__(
+            [talks[position] for position in positions_from_bits(bits)]
+        )
+
+    def facet_counts(self, request: dict) -> dict[str, dict[str, int]]:
+        """facetの値ごとに、requestにその値を加えたときに絞り込まれるトークの数
+
+        tracks / levels の条件はそれぞれのfacet（track / level）を数えるときには外す。
+        つまり選択肢を切り替えたときの件数になる。
+        """
+        facets = self.facet_index()
+        facet_to_clause_and_table = {
+            "track": ("tracks", TRACKS),
+            "level": ("levels", LEVELS),
+            "speaking_language": (None, LANGUAGES),
+            "slide_language": (None, LANGUAGES),
+        }
+        clause_to_bits = {}
+        counts = {}
+        for facet, (own_clause, table) in facet_to_clause_and_table.items():
+            if own_clause not in clause_to_bits:
+                without_own_clause = dict(request)
+                if own_clause is not None:
+                    without_own_clause[own_clause] = []
+                clause_to_bits[own_clause] = self.plan(
+                    without_own_clause
+                ).execute(facets.all)
+            bits = clause_to_bits[own_clause]
+            counts[facet] = {
+                table.decode(code): popcount(value_bits & bits)
+                for code, value_bits in facets.bitsets[facet].items()
+                if code >= 0
+            }
+        if request["keywords"]:
+            self._keyword_queries += 1
+        return counts
 
 
+@slotted
 @dataclass
 class Slot:
     room: str
@@ -210,14 +538,27 @@ class Slot:
     start: time
     number: int
 
+    def __post_init__(self):
+        self.room = ROOMS.intern(self.room)
+
+    @property
+    def room_code(self) -> int:
+        """categorical.pyのROOMSの符号（今のroomから引く）"""
+        return ROOMS.encode(self.room)
+
+    def __reduce__(self):
+        return (
+            self.__class__,
+            (self.room, self.day, self.start, self.number),
+        )
+
     @classmethod
     def create(cls, room: str, start_datetime_str: str, number: int):
-        start_datetime = datetime.strptime(
-            start_datetime_str, SESSIONIZE_DATETIME_FORMAT
-        )
+        start_datetime = parse_sessionize_datetime(start_datetime_str)
         return cls(room, start_datetime.date(), start_datetime.time(), number)
 
 
+@slotted
 @dataclass
 class ScheduledTalk(Talk):
     slot: Slot
@@ -242,19 +583,122 @@ class ScheduledTalk(Talk):
         return self.slot.number
 
 
+class LazyScheduledTalk(ScheduledTalk):
+    """sessionのdictとScheduledTalkFactoryを持ち、フィールドを初めて参照したときに作る
+
+    id / title / description / slide_url / recording_url はすぐに設定する。
+    作ったフィールドはインスタンスに保持し、2回目以降は作らない。
+    """
+
+    __slots__ = ("_session", "_factory")
+
+    _LAZY_FIELDS = {
+        "category": "create_category",
+        "answer": "create_answer",
+        "speakers": "create_speakers",
+        "slot": "create_slot",
+        "duration_min": "create_duration_min",
+    }
+
+    def __init__(self, session, factory):
+        (
+            self.id,
+            self.title,
+            self.description,
+            self.slide_url,
+            self.recording_url,
+        ) = factory.create_plain_fields(session)
+        self._search_text = None
+        self._session = session
+        self._factory = factory
+
+    def __getattr__(self, name):
+        # 未設定のフィールドを参照したときだけ呼ばれる
+        method_name = self._LAZY_FIELDS.get(name)
+        if method_name is None or name.startswith("_"):
+            raise AttributeError(name)
+        value = getattr(self._factory, method_name)(self._session)
+        setattr(self, name, value)
+        return value
+
+    def __eq__(self, other):
+        # 遅延していないScheduledTalkとも、フィールドが等しければ等しいとみなす
+        if not isinstance(other, ScheduledTalk):
+            return NotImplemented
+        return all(
+            getattr(self, f.name) == getattr(other, f.name)
+            for f in fields(ScheduledTalk)
+            if f.compare
+        )
+
+    def materialize(self) -> ScheduledTalk:
+        """全てのフィールドを作り、通常のScheduledTalkとして返す"""
+        return ScheduledTalk(
+            *(getattr(self, f.name) for f in fields(ScheduledTalk) if f.init)
+        )
+
+
 @dataclass
 class ScheduledTalks(Sequence):
     talks: list[ScheduledTalk]
+    # スピーカーのIDから登壇するトークを引く辞書。トークを組み立てるときに作る
+    speaker_to_talks: dict[str, list[ScheduledTalk]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
 
     def __len__(self):
         return len(self.talks)
 
     def __getitem__(self, key):
         if isinstance(key, slice):
-            return self.__class__(self.talks[key])
+            talks = self.talks[key]
+            return self.__class__(talks, self._speaker_to_talks_in(talks))
         return self.talks[key]
 
+    @classmethod
+    def concatenate(cls, talks_list) -> ScheduledTalks:
+        """複数のScheduledTalksを順につなげる。スピーカーからトークを引く辞書もまとめる"""
+        talks = []
+        merged = {}
+        for scheduled_talks in talks_list:
+            talks.extend(scheduled_talks)
+            items = scheduled_talks.speaker_to_talks.items()
+            for speaker_id, speaker_talks in items:
+                merged.setdefault(speaker_id, []).extend(speaker_talks)
+        return cls(talks, merged)
+
+    def talks_by_speaker(self, speaker_id: str) -> list[ScheduledTalk]:
+        """スピーカーが登壇するトーク（組み立てた順）"""
+        return list(self.speaker_to_talks.get(speaker_id, ()))
+
+    def _speaker_to_talks_in(self, talks):
+        ids = set(map(id, talks))
+        speaker_to_talks = {}
+        for speaker_id, speaker_talks in self.speaker_to_talks.items():
+            speaker_talks = [t for t in speaker_talks if id(t) in ids]
+            if speaker_talks:
+                speaker_to_talks[speaker_id] = speaker_talks
+        return speaker_to_talks
+
     def sorted(self):
+        # roomは文字列ではなく、符号から引いた辞書順の順位で比べる
+        # 異なるroomごとに1度だけ符号を引き、新しいroomに符号を振ってから順位の表を作る
+        room_to_code = {
+            room: ROOMS.encode(room)
+            for room in {talk.slot.room for talk in self.talks}
+        }
+        ranks = ROOMS.ranks
+        room_to_rank = {
+            room: ranks[code] for room, code in room_to_code.items()
+        }
         return self.__class__(
-            sorted(self.talks, key=lambda t: (t.day, t.slot_number, t.room))
+            sorted(
+                self.talks,
+                key=lambda t: (
+                    t.day,
+                    t.slot_number,
+                    room_to_rank[t.slot.room],
+                ),
+            ),
+            self.speaker_to_talks,
         )
@@ -0,0 +1,18 @@
+from datetime import datetime
+from functools import lru_cache
+
+from pyconjp_domains.constants import SESSIONIZE_DATETIME_FORMAT
+
+
+@lru_cache(maxsize=4096)
+def parse_sessionize_datetime(string: str) -> datetime:
+    """sessionizeの日時文字列をパースする。同じ文字列はキャッシュから返す"""
+    # "YYYY-MM-DDTHH:MM:SS" はstrptimeよりfromisoformatの方がずっと速い
+    if (
+        len(string) == 19
+        and string[10] == "T"
+        and string[13] == ":"
+        and string[16] == ":"
+    ):
+        return datetime.fromisoformat(string)
+    return datetime.strptime(string, SESSIONIZE_DATETIME_FORMAT)
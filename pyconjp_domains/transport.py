@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import base64
+import io
+import random
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from urllib.error import HTTPError
+from urllib.parse import unquote, urljoin, urlsplit
+from urllib.request import Request, getproxies, proxy_bypass, urlopen
+
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+REDIRECT_STATUSES = frozenset([301, 302, 303, 307, 308])
+# urllib.request.HTTPRedirectHandlerと同じ上限
+MAX_REDIRECTS = 10
+
+
+class Response:
+    """Transport.openが返すレスポンス。readはgzipを逐次展開したバイト列を返す"""
+
+    def __init__(self, raw):
+        self._raw = raw
+        # file://などをurlopenで開いたレスポンスには、statusがないことがある
+        self.status = raw.getcode()
+        self.headers = raw.headers
+        if raw.headers.get("Content-Encoding", "").lower() == "gzip":
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        else:
+            self._decompressor = None
+        self._pending = b""
+
+    def read(self, size=-1):
+        if self._decompressor is None:
+            return self._raw.read() if size < 0 else self._raw.read(size)
+        if size < 0:
+            chunks = [self._pending]
+            self._pending = b""
+            while True:
+                chunk = self._read_decompressed(64 * 1024)
+                if not chunk:
+                    return b"".join(chunks)
+                chunks.append(chunk)
+        while len(self._pending) < size:
+            chunk = self._read_decompressed(size)
+            if not chunk:
+                break
+            self._pending += chunk
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    def _read_decompressed(self, size):
+        # 圧縮されたチャンクが小さく展開結果が空になることがあるので、空でなくなるまで読む
+        while True:
+            compressed = self._raw.read(size)
+            if not compressed:
+                return self._decompressor.flush()
+            data = self._decompressor.decompress(compressed)
+            if data:
+                return data
+
+
+class Transport:
+    """ホストごとにkeep-aliveの接続を使い回すHTTPクライアント
+
+    gzipでの転送を要求し、429 / 5xxのときは指数バックオフ（full jitter）で再試行する。
+    urlopenと同じく、環境変数（HTTP_PROXY / HTTPS_PROXY / NO_PROXY）などのプロキシの設定に従い、
+    リダイレクトをたどる。http / https以外のURL（file://など）はurlopenで開く。
+    複数スレッドから同時に使ってよい。
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        timeout: float | None = 30.0,
+        pool_size: int = 4,
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def request(self, url: str, headers: dict[str, str] | None = None):
+        """レスポンスを最後まで読み、(Response, ボディ) を返す"""
+        with self.open(url, headers) as res:
+            return res, res.read()
+
+    @contextmanager
+    def open(self, url: str, headers: dict[str, str] | None = None):
+        """2xxのレスポンスを返す。それ以外はurllib.error.HTTPErrorを送出する"""
+        if urlsplit(url).scheme not in ("http", "https"):
+            request = Request(url, headers=headers or {})
+            with urlopen(request, timeout=self.timeout) as raw:
+                yield Response(raw)
+            return
+
+        request_headers = {"Accept-Encoding": "gzip"}
+        request_headers.update(headers or {})
+        for _ in range(MAX_REDIRECTS + 1):
+            key, connection, raw = self._send_with_retries(
+                url, request_headers
+            )
+            location = raw.headers.get("Location")
+            if raw.status not in REDIRECT_STATUSES or location is None:
+                break
+            raw.read()
+            self._release(key, connection, raw)
+            redirected_url = urljoin(url, location)
+            # urlopenと同じく、file://などへのリダイレクトはたどらない
+            if urlsplit(redirected_url).scheme not in ("http", "https"):
+                raise HTTPError(
+                    url,
+                    raw.status,
+                    f"redirection to {redirected_url} is not allowed",
+                    raw.headers,
+                    io.BytesIO(b""),
+                )
+            url = redirected_url
+        else:
+            raise HTTPError(
+                url,
+                raw.status,
+                f"more than {MAX_REDIRECTS} redirections",
+                raw.headers,
+                io.BytesIO(b""),
+            )
+
+        if not 200 <= raw.status < 300:
+            body = raw.read()
+            self._release(key, connection, raw)
+            raise HTTPError(
+                url, raw.status, raw.reason, raw.headers, io.BytesIO(body)
+            )
+        try:
+            yield Response(raw)
+            # 読み残しがあると接続を使い回せないので読み切る
+            while raw.read(64 * 1024):
+                pass
+        except BaseException:
+            connection.close()
+            raise
+        self._release(key, connection, raw)
+
+    def _send_with_retries(self, url, headers):
+        parts = urlsplit(url)
+        proxy = self._proxy_for(parts)
+        key = (parts.scheme, parts.hostname, parts.port, proxy)
+        if proxy is not None and parts.scheme == "http":
+            # httpはプロキシにURL全体を送る（httpsはトンネルの中で送る）
+            path = url
+            headers = {**headers, **_proxy_headers(proxy)}
+        else:
+            path = parts.path or "/"
+            if parts.query:
+                path += "?" + parts.query
+
+        for attempt in range(self.max_retries + 1):
+            connection, raw = self._send(key, path, headers)
+            if raw.status in RETRY_STATUSES and attempt < self.max_retries:
+                raw.read()
+                self._release(key, connection, raw)
+                time.sleep(self._backoff(attempt, raw.headers))
+                continue
+            break
+        return key, connection, raw
+
+    @staticmethod
+    def _proxy_for(parts):
+        """partsに使うプロキシのURL（urlsplitの結果）。使わなければNone"""
+        proxy = getproxies().get(parts.scheme)
+        if proxy is None or proxy_bypass(parts.hostname):
+            return None
+        if "://" not in proxy:
+            proxy = "http://" + proxy
+        return urlsplit(proxy)
+
+    def close(self):
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for connections in pools.values():
+            for connection in connections:
+                connection.close()
+
+    def _send(self, key, path, headers):
+        connection = self._acquire(key)
+        try:
+            connection.request("GET", path, headers=headers)
+            return connection, connection.getresponse()
+        except (HTTPException, ConnectionError):
+            # 使い回した接続がサーバー側で閉じられていたら、新しい接続で1度だけやり直す
+            connection.close()
+            connection = self._connect(key)
+            connection.request("GET", path, headers=headers)
+            return connection, connection.getresponse()
+
+    def _acquire(self, key):
+        with self._lock:
+            connections = self._pools.get(key)
+            if connections:
+                return connections.pop()
+        return self._connect(key)
+
+    def _connect(self, key):
+        scheme, host, port, proxy = key
+        if proxy is None:
+            connection_class = (
+                HTTPSConnection if scheme == "https" else HTTPConnection
+            )
+            return connection_class(host, port, timeout=self.timeout)
+        if scheme == "https":
+            # プロキシにCONNECTでトンネルを作り、その中でTLSを使う
+            connection = HTTPSConnection(
+                proxy.hostname, proxy.port, timeout=self.timeout
+            )
+            connection.set_tunnel(host, port, _proxy_headers(proxy))
+            return connection
+        return HTTPConnection(proxy.hostname, proxy.port, timeout=self.timeout)
+
+    def _release(self, key, connection, raw):
+        if raw.will_close:
+            connection.close()
+            return
+        with self._lock:
+            connections = self._pools.setdefault(key, [])
+            if len(connections) < self.pool_size:
+                connections.append(connection)
+                return
+        connection.close()
+
+    def _backoff(self, attempt, headers):
+        retry_after = headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        ceiling = min(self.max_backoff, self.backoff_factor * 2**attempt)
+        return random.uniform(0, ceiling)
+
+
+def _proxy_headers(proxy):
+    """プロキシのURLに認証情報があれば、Proxy-Authorizationのヘッダー"""
+    if proxy.username is None:
+        return {}
+    credentials = f"{unquote(proxy.username)}:{unquote(proxy.password or '')}"
+    encoded = base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+    return {"Proxy-Authorization": f"Basic {encoded}"}
+
+
+default_transport = Transport()
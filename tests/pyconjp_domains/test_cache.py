@@ -0,0 +1,107 @@
+import io
+from email.message import Message
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import MagicMock
+from urllib.error import HTTPError
+
+import pyconjp_domains.cache as c
+
+URL = "https://sessionize.com/api/v2/abc/view/All"
+
+
+def create_response(body, etag=None, last_modified=None):
+    headers = Message()
+    if etag:
+        headers["ETag"] = etag
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    response = MagicMock()
+    response.headers = headers
+    return response, body
+
+
+def create_not_modified():
+    return HTTPError(URL, 304, "Not Modified", Message(), io.BytesIO())
+
+
+class HttpCacheTestCase(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.transport = MagicMock()
+        self.request = self.transport.request
+
+    def test_fetch_first_time(self):
+        self.request.return_value = create_response(
+            b'{"sessions": []}', '"v1"'
+        )
+        sut = c.HttpCache(self.directory.name, transport=self.transport)
+
+        actual = sut.fetch(URL)
+
+        self.assertEqual(actual, {"sessions": []})
+        self.request.assert_called_once_with(URL, {})
+        self.assertTrue(sut.body_path(URL).exists())
+        self.assertTrue(sut.meta_path(URL).exists())
+
+    def test_fetch_not_modified(self):
+        self.request.return_value = create_response(
+            b'{"sessions": []}', '"v1"', "Fri, 15 Oct 2021 00:00:00 GMT"
+        )
+        sut = c.HttpCache(self.directory.name, transport=self.transport)
+        expected = sut.fetch(URL)
+        self.request.reset_mock()
+        self.request.side_effect = create_not_modified()
+
+        actual = sut.fetch(URL)
+
+        self.assertIs(actual, expected)
+        self.request.assert_called_once_with(
+            URL,
+            {
+                "If-None-Match": '"v1"',
+                "If-Modified-Since": "Fri, 15 Oct 2021 00:00:00 GMT",
+            },
+        )
+
+    def test_fetch_not_modified_from_disk(self):
+        self.request.return_value = create_response(
+            b'{"sessions": []}', '"v1"'
+        )
+        c.HttpCache(self.directory.name, transport=self.transport).fetch(URL)
+        self.request.reset_mock()
+        self.request.side_effect = create_not_modified()
+
+        actual = c.HttpCache(
+            self.directory.name, transport=self.transport
+        ).fetch(URL)
+
+        self.assertEqual(actual, {"sessions": []})
+
+    def test_fetch_within_ttl(self):
+        self.request.return_value = create_response(
+            b'{"sessions": []}', '"v1"'
+        )
+        sut = c.HttpCache(self.directory.name, 60, self.transport)
+        sut.fetch(URL)
+        self.request.reset_mock()
+
+        actual = sut.fetch(URL)
+
+        self.assertEqual(actual, {"sessions": []})
+        self.request.assert_not_called()
+
+    def test_fetch_modified(self):
+        self.request.return_value = create_response(
+            b'{"sessions": []}', '"v1"'
+        )
+        sut = c.HttpCache(self.directory.name, transport=self.transport)
+        sut.fetch(URL)
+        self.request.return_value = create_response(
+            b'{"sessions": [{"id": 1}]}', '"v2"'
+        )
+
+        actual = sut.fetch(URL)
+
+        self.assertEqual(actual, {"sessions": [{"id": 1}]})
@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+from pyconjp_domains import categorical as c
+
+
+class CategoricalTestCase(TestCase):
+    def setUp(self):
+        self.table = c.Categorical(["room2", "room1"])
+
+    def test_encode(self):
+        self.assertEqual(self.table.encode("room2"), 0)
+        self.assertEqual(self.table.encode("room1"), 1)
+        self.assertEqual(self.table.encode("room3"), 2)
+        self.assertEqual(self.table.encode(None), -1)
+        self.assertEqual(len(self.table), 3)
+
+    def test_decode(self):
+        self.assertEqual(self.table.decode(1), "room1")
+        self.assertIsNone(self.table.decode(-1))
+
+    def test_intern(self):
+        value = "".join(["room", "1"])
+
+        actual = self.table.intern(value)
+
+        self.assertIs(actual, self.table.decode(1))
+
+    def test_code_of(self):
+        self.assertEqual(self.table.code_of("room1"), 1)
+        self.assertIsNone(self.table.code_of("room3"))
+        self.assertNotIn("room3", self.table)
+
+    def test_codes_of(self):
+        actual = self.table.codes_of(["room1", "room3", "room2"])
+
+        self.assertEqual(actual, {0, 1})
+
+    def test_ranks(self):
+        self.assertEqual(self.table.ranks, [1, 0])
+
+        self.table.encode("room0")
+
+        self.assertEqual(self.table.ranks, [2, 1, 0])
+
+    def test_plenary_level(self):
+        self.assertIn("All", c.LEVELS)
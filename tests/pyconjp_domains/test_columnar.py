@@ -0,0 +1,111 @@
+from array import array
+from datetime import date, time
+from unittest import TestCase
+
+from pyconjp_domains import columnar as c
+from pyconjp_domains import talks as t
+
+
+class EncodeStringsTestCase(TestCase):
+    def test_encode_strings(self):
+        table, codes = c.encode_strings(["room2", None, "room1", "room2"])
+
+        self.assertEqual(table, ["room1", "room2"])
+        self.assertEqual(codes, array("i", [1, -1, 0, 1]))
+
+
+class ColumnarScheduledTalksTestCase(TestCase):
+    def setUp(self):
+        self.scheduled_talks = t.ScheduledTalks(
+            [
+                t.ScheduledTalk(
+                    "123456",
+                    "ScheduledTalkのプロパティのテスト",
+                    "テストプロパティテスト",
+                    t.Category(
+                        "Web programming", "beginner", "English", "Both"
+                    ),
+                    t.QuestionAnswer(
+                        "継承して属性を追加します",
+                        "Pythonのunittestを使った経験",
+                        "テストを先に書いてRed\r\n実装してGreenという体験",
+                    ),
+                    [t.Speaker("すごい人", "いくつかのすごい経歴")],
+                    t.Slot("#pyconjp_1", date(2021, 10, 15), time(13, 30), 2),
+                    30,
+                    "https://example.com/slide",
+                ),
+                t.ScheduledTalk(
+                    "0b9f27cc-9da4-4010-9c8e-9d24d31956d4",
+                    "Opening (Day1)",
+                    None,
+                    None,
+                    None,
+                    [],
+                    t.Slot("plenary", date(2021, 10, 15), time(12, 40), 1),
+                    20,
+                ),
+            ]
+        )
+        self.talks = c.ColumnarScheduledTalks.from_talks(self.scheduled_talks)
+
+    def test_row_view(self):
+        talk = self.talks[0]
+
+        self.assertEqual(talk.room, "#pyconjp_1")
+        self.assertEqual(talk.day, date(2021, 10, 15))
+        self.assertEqual(talk.start_time, time(13, 30))
+        self.assertEqual(talk.slot_number, 2)
+        self.assertEqual(talk.track, "Web programming")
+        self.assertEqual(talk.elevator_pitch, "継承して属性を追加します")
+        self.assertEqual(talk.speaker_names, ["すごい人"])
+        self.assertEqual(
+            talk.as_list(["id", "duration_min", "slide_url"]),
+            ["123456", 30, "https://example.com/slide"],
+        )
+
+    def test_service_session_row_view(self):
+        talk = self.talks[-1]
+
+        self.assertIsNone(talk.category)
+        self.assertIsNone(talk.level)
+        self.assertIsNone(talk.take_away)
+
+    def test_materialize(self):
+        self.assertEqual(
+            [talk.materialize() for talk in self.talks],
+            self.scheduled_talks.talks,
+        )
+        self.assertEqual(self.talks.to_scheduled_talks(), self.scheduled_talks)
+
+    def test_slice(self):
+        actual = self.talks[1:]
+
+        self.assertIsInstance(actual, c.ColumnarScheduledTalks)
+        self.assertEqual(actual, self.scheduled_talks[1:])
+
+    def test_sorted(self):
+        from .fixtures.talks__scheduled_talks__sorted import expected, talks
+
+        actual = c.ColumnarScheduledTalks.from_talks(talks).sorted()
+
+        self.assertEqual(actual, expected)
+
+    def test_sorted_empty(self):
+        actual = c.ColumnarScheduledTalks.from_talks([]).sorted()
+
+        self.assertEqual(len(actual), 0)
+
+    def test_where(self):
+        actual = self.talks.where(room="plenary")
+
+        self.assertEqual(
+            [talk.id for talk in actual],
+            ["0b9f27cc-9da4-4010-9c8e-9d24d31956d4"],
+        )
+        self.assertEqual(len(self.talks.where(track="Machine learning")), 0)
+        self.assertEqual(len(self.talks.where(level=None)), 1)
+
+    def test_where_unknown_column(self):
+        with self.assertRaises(ValueError):
+            self.talks.where(title="Opening (Day1)")
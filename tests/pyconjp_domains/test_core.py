@@ -1,6 +1,16 @@
+import asyncio
+import copy
+import io
+import json
+import threading
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
 from unittest import TestCase
+from unittest.mock import patch
 
 import pyconjp_domains.core as c
+from pyconjp_domains.talks import ScheduledTalks
 
 
 class FilterSessionsTestCase(TestCase):
@@ -46,3 +56,189 @@ class CreateTalksFromDataTestCase(TestCase):
         actual = c.create_talks_from_data(data)
 
         self.assertEqual(actual, expected)
+
+
+class TalksBySpeakerTestCase(TestCase):
+    def test_talks_by_speaker(self):
+        from .fixtures.core__create_talks_from_data import (
+            data,
+            keynote_speaker_uuid,
+        )
+
+        for lazy in (False, True):
+            with self.subTest(lazy=lazy):
+                actual = c.create_talks_from_data(data, lazy=lazy)
+
+                self.assertEqual(
+                    actual.talks_by_speaker(keynote_speaker_uuid), [actual[2]]
+                )
+                self.assertIs(
+                    actual.talks_by_speaker(keynote_speaker_uuid)[0],
+                    actual[2],
+                )
+                self.assertEqual(actual.talks_by_speaker("unknown"), [])
+
+
+class CreateTalksFromStreamTestCase(TestCase):
+    def test_create_talks(self):
+        from .fixtures.core__create_talks_from_data import data, expected
+
+        stream = io.BytesIO(json.dumps(data).encode("utf-8"))
+
+        actual = c.create_talks_from_stream(stream)
+
+        self.assertEqual(actual, expected)
+
+
+class FetchTalksTestCase(TestCase):
+    @patch("pyconjp_domains.core.fetch_data")
+    def test_question_titles(self, fetch_data):
+        from .fixtures.core__create_talks_from_data import data
+
+        fetch_data.return_value = data
+
+        actual = c.fetch_talks(
+            c.sessionize_url("abc"),
+            question_titles={"elevator_pitch": "存在しない質問"},
+        )
+
+        self.assertIsNone(actual[3].elevator_pitch)
+        self.assertEqual(actual[3].prior_knowledge, "トーク2の前提知識")
+        self.assertEqual(actual[3].take_away, "トーク2で持ち帰れるもの")
+
+
+class FetchManyTestCase(TestCase):
+    @patch("pyconjp_domains.core.fetch_talks")
+    def test_fetch_many(self, fetch_talks):
+        talks_by_url = {
+            c.sessionize_url("abc"): ScheduledTalks(["a1", "a2"]),
+            c.sessionize_url("def"): ScheduledTalks(["d1"]),
+        }
+        fetch_talks.side_effect = lambda url, *_, **__: talks_by_url[url]
+
+        actual = asyncio.run(c.fetch_many(["abc", "def"], concurrency=1))
+
+        self.assertEqual(actual, ScheduledTalks(["a1", "a2", "d1"]))
+
+    @patch("pyconjp_domains.core.fetch_talks")
+    def test_fetch_many_timeout(self, fetch_talks):
+        fetch_talks.side_effect = lambda url, cache, transport: time.sleep(0.2)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(c.fetch_many(["abc"], timeout=0.01))
+
+        transport = fetch_talks.call_args[1]["transport"]
+        self.assertEqual(transport.timeout, 0.01)
+
+    @patch("pyconjp_domains.core.Transport")
+    @patch("pyconjp_domains.core.fetch_talks")
+    def test_close_created_transports(self, fetch_talks, transport_class):
+        closed = threading.Semaphore(0)
+        transport_class.return_value.close.side_effect = closed.release
+        fetch_talks.side_effect = lambda url, cache, transport: time.sleep(
+            0.2 if url.endswith("/slow/view/All") else 0
+        )
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(c.fetch_many(["fast", "slow"], timeout=0.1))
+
+        # 打ち切った取得のTransportも、スレッドが終わるときに閉じる
+        for _ in range(2):
+            self.assertTrue(closed.acquire(timeout=5))
+        self.assertEqual(transport_class.call_count, 2)
+
+    @patch("pyconjp_domains.core.fetch_talks")
+    def test_fetch_many_timeout_does_not_wait_threads(self, fetch_talks):
+        fetch_talks.side_effect = lambda url, cache, transport: time.sleep(1)
+
+        started = time.perf_counter()
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(c.fetch_many(["abc", "def"], timeout=0.1))
+
+        self.assertLess(time.perf_counter() - started, 0.5)
+
+    @patch("pyconjp_domains.core.fetch_talks")
+    def test_fetch_talks_async_timeout_does_not_wait_thread(self, fetch_talks):
+        fetch_talks.side_effect = lambda url, cache, transport: time.sleep(1)
+
+        started = time.perf_counter()
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(c.fetch_talks_async("http://example.com", timeout=0.1))
+
+        self.assertLess(time.perf_counter() - started, 0.5)
+
+
+class LoadTalksFromSnapshotTestCase(TestCase):
+    def test_load(self):
+        from .fixtures.core__create_talks_from_data import (
+            data,
+            expected,
+            keynote_speaker_uuid,
+        )
+
+        with TemporaryDirectory() as directory:
+            for endpoint_id in ("abc", "def"):
+                Path(directory, f"{endpoint_id}.json").write_text(
+                    json.dumps(data), encoding="utf-8"
+                )
+
+            actual = c.fetch_talks(None, snapshot=directory)
+
+        self.assertEqual(actual, ScheduledTalks(expected.talks * 2))
+        self.assertEqual(
+            actual.talks_by_speaker(keynote_speaker_uuid),
+            [actual[2], actual[len(expected) + 2]],
+        )
+
+
+class CreateLazyTalksFromDataTestCase(TestCase):
+    def test_create_talks(self):
+        from .fixtures.core__create_talks_from_data import data, expected
+
+        actual = c.create_talks_from_data(data, lazy=True)
+
+        self.assertEqual(actual, expected)
+        self.assertEqual(expected, actual)
+
+
+class CreateTalksInParallelTestCase(TestCase):
+    def test_create_talks(self):
+        from .fixtures.core__create_talks_from_data import data, expected
+
+        actual = c.create_talks_from_data(data, workers=2)
+
+        self.assertEqual(actual, expected)
+
+    def test_share_instances(self):
+        from .fixtures.core__create_talks_from_data import (
+            data,
+            keynote_speaker_uuid,
+        )
+
+        # 同じカテゴリ・スピーカーのトークが別のチャンクに入るよう、sessionsを2周させる
+        data = copy.deepcopy(data)
+        data["sessions"] += [
+            dict(session, id=f"{session['id']}-2")
+            for session in data["sessions"]
+        ]
+        expected = c.create_talks_from_data(data)
+
+        actual = c.create_talks_from_data(data, workers=2)
+
+        def count_instances(talks):
+            categories = {id(t.category) for t in talks if t.category}
+            speakers = {id(s) for t in talks for s in t.speakers}
+            return len(categories), len(speakers)
+
+        self.assertEqual(actual, expected)
+        self.assertEqual(count_instances(actual), count_instances(expected))
+        self.assertEqual(
+            actual.talks_by_speaker(keynote_speaker_uuid),
+            [actual[2], actual[len(data["sessions"]) // 2 + 2]],
+        )
+
+    def test_lazy(self):
+        from .fixtures.core__create_talks_from_data import data
+
+        with self.assertRaises(ValueError):
+            c.create_talks_from_data(data, lazy=True, workers=2)
@@ -0,0 +1,31 @@
+import json
+from unittest import TestCase
+
+import pyconjp_domains.decoders as d
+
+
+class GetDecoderTestCase(TestCase):
+    def test_default(self):
+        actual = d.get_decoder()
+
+        self.assertIn(actual, d.available_backends().values())
+
+    def test_json(self):
+        actual = d.get_decoder("json")
+
+        self.assertIs(actual, json.loads)
+
+    def test_unavailable(self):
+        with self.assertRaises(ValueError):
+            d.get_decoder("simdjson")
+
+    def test_same_output(self):
+        from .fixtures.core__create_talks_from_data import data
+
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+        for name, loads in d.available_backends().items():
+            with self.subTest(name=name):
+                actual = loads(body)
+
+                self.assertEqual(actual, data)
@@ -0,0 +1,64 @@
+from unittest import TestCase
+
+from pyconjp_domains import facets as f
+from pyconjp_domains import talks as t
+from pyconjp_domains.categorical import TRACKS
+
+
+class BitsTestCase(TestCase):
+    def test_bits_from_positions(self):
+        self.assertEqual(f.bits_from_positions([0, 2, 9], 10), 0b1000000101)
+        self.assertEqual(f.bits_from_positions([], 0), 0)
+
+    def test_positions_from_bits(self):
+        self.assertEqual(f.positions_from_bits(0b1000000101), [0, 2, 9])
+        self.assertEqual(f.positions_from_bits(0), [])
+
+    def test_popcount(self):
+        self.assertEqual(f.popcount(0b1000000101), 3)
+
+
+class FacetIndexTestCase(TestCase):
+    def setUp(self):
+        def talk(category):
+            return t.Talk(1, "トーク", None, category, None, [])
+
+        self.index = f.FacetIndex(
+            [
+                talk(
+                    t.Category(
+                        "Web programming", "Beginner", "Japanese", "Both"
+                    )
+                ),
+                talk(None),
+                talk(
+                    t.Category(
+                        "Machine learning", "Advanced", "English", "Both"
+                    )
+                ),
+                talk(
+                    t.Category(
+                        "Web programming", "Advanced", "Japanese", "Both"
+                    )
+                ),
+            ]
+        )
+
+    def test_bitsets(self):
+        bitsets = self.index.bitsets["track"]
+
+        self.assertEqual(bitsets[TRACKS.code_of("Web programming")], 0b1001)
+        self.assertEqual(bitsets[TRACKS.code_of("Machine learning")], 0b0100)
+        self.assertEqual(bitsets[-1], 0b0010)
+        self.assertEqual(self.index.all, 0b1111)
+
+    def test_count(self):
+        codes = TRACKS.codes_of(["Web programming", "Machine learning"])
+
+        self.assertEqual(self.index.count("track", codes), 3)
+
+    def test_union(self):
+        codes = TRACKS.codes_of(["Web programming", "Machine learning"])
+
+        self.assertEqual(self.index.union("track", codes), 0b1101)
+        self.assertEqual(self.index.union("track", []), 0)
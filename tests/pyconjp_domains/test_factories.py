@@ -1,9 +1,9 @@
 from datetime import date
-from unittest import TestCase
+from unittest import TestCase, skipIf
 from unittest.mock import MagicMock, call, patch
 
 from pyconjp_domains import factories as f
-from pyconjp_domains.talks import ScheduledTalk
+from pyconjp_domains.talks import Category, QuestionAnswer, ScheduledTalk
 
 
 class CategoryFactoryTestCase(TestCase):
@@ -42,6 +42,28 @@ class CategoryFactoryTestCase(TestCase):
 
                 self.assertEqual(actual, expected)
 
+    def test_create_shares_instance(self):
+        sut = f.CategoryFactory(
+            self.item_id_to_category_title, self.item_id_to_name
+        )
+
+        actual = sut.create([80004, 80013], False)
+
+        self.assertIs(actual, sut.create([80004, 80013], False))
+        self.assertIsNot(actual, sut.create([80004, 80013], True))
+
+    def test_create_ignores_other_categories(self):
+        item_id_to_category_title = {
+            **self.item_id_to_category_title,
+            80041: "Other",
+        }
+        item_id_to_name = {**self.item_id_to_name, 80041: "Other1"}
+        sut = f.CategoryFactory(item_id_to_category_title, item_id_to_name)
+
+        actual = sut.create([80004, 80041], False)
+
+        self.assertEqual(actual, Category("Track4", None, None, None))
+
     def test_from_(self):
         from .fixtures.factories__category_factory import categories_raw_data
 
@@ -81,6 +103,58 @@ class QuestionAnswerFactoryTestCase(TestCase):
 
         self.assertEqual(actual, create_expected)
 
+    def test_create_with_question_titles(self):
+        question_titles = {
+            "elevator_pitch": "Elevator Pitch",
+            "audience_prior_knowledge": "Prerequisites",
+            "audience_take_away": "Take away",
+        }
+        question_value_to_id_map = {
+            "Elevator Pitch": 40001,
+            "Prerequisites": 40002,
+            "Take away": 40003,
+        }
+        question_answers_data = [
+            {"questionId": 40003, "answerValue": "持ち帰れるもの"},
+            {"questionId": 40002, "answerValue": "前提知識"},
+            {"questionId": 49999, "answerValue": "対象外の質問"},
+        ]
+
+        sut = f.QuestionAnswerFactory(
+            question_value_to_id_map, question_titles
+        )
+        actual = sut.create(question_answers_data)
+
+        self.assertEqual(
+            actual, QuestionAnswer(None, "前提知識", "持ち帰れるもの")
+        )
+
+    def test_create_with_partial_question_titles(self):
+        question_value_to_id_map = dict(
+            self.question_value_to_id_map, Prerequisites=40002
+        )
+        prior_knowledge_id = self.question_value_to_id_map[
+            f.QUESTION_TITLES["audience_prior_knowledge"]
+        ]
+        pitch_id = self.question_value_to_id_map[
+            f.QUESTION_TITLES["elevator_pitch"]
+        ]
+        question_answers_data = [
+            {"questionId": pitch_id, "answerValue": "エレベータピッチ"},
+            {"questionId": 40002, "answerValue": "前提知識"},
+            {"questionId": prior_knowledge_id, "answerValue": "使わない"},
+        ]
+
+        sut = f.QuestionAnswerFactory(
+            question_value_to_id_map,
+            {"audience_prior_knowledge": "Prerequisites"},
+        )
+        actual = sut.create(question_answers_data)
+
+        self.assertEqual(
+            actual, QuestionAnswer("エレベータピッチ", "前提知識", None)
+        )
+
     def test_from_(self):
         from .fixtures.factories__question_answer_factory import (
             questions_raw_data,
@@ -205,6 +279,42 @@ class SpeakerFactoryTestCase(TestCase):
 
         self.assertEqual(actual, create_expected)
 
+    def test_create_shares_instance(self):
+        from .fixtures.factories__speaker_factory import create_target_id
+
+        sut = f.SpeakerFactory(self.id_to_raw_data_map)
+
+        actual = sut.create(create_target_id)
+
+        self.assertIs(actual, sut.create(create_target_id))
+
+    def test_talks_of(self):
+        from .fixtures.factories__speaker_factory import create_target_id
+
+        sut = f.SpeakerFactory(self.id_to_raw_data_map)
+        sut.register_talk(create_target_id, "talk1")
+        sut.register_talk(create_target_id, "talk2")
+
+        self.assertEqual(sut.talks_of(create_target_id), ["talk1", "talk2"])
+        self.assertEqual(sut.talks_of("unknown"), [])
+        self.assertEqual(
+            sut.speaker_to_talks(), {create_target_id: ["talk1", "talk2"]}
+        )
+
+    def test_reuse_speakers(self):
+        from .fixtures.factories__speaker_factory import create_target_id
+
+        speaker = f.SpeakerFactory(self.id_to_raw_data_map).create(
+            create_target_id
+        )
+
+        sut = f.SpeakerFactory(
+            self.id_to_raw_data_map, {create_target_id: speaker}
+        )
+
+        self.assertIs(sut.create(create_target_id), speaker)
+        self.assertEqual(sut.id_to_speaker(), {create_target_id: speaker})
+
     def test_from_(self):
         from .fixtures.factories__speaker_factory import speakers_raw_data
 
@@ -246,6 +356,30 @@ class ScheduledTalkFactoryTestCase(TestCase):
 
         self.assertEqual(actual, 30)
 
+    def test_create_plain_fields(self):
+        from .fixtures.factories__scheduled_talk_factory import (
+            service_session_data,
+            talk_data,
+        )
+
+        for session, slide_url, recording_url in (
+            (talk_data, talk_data["liveUrl"], talk_data["recordingUrl"]),
+            (service_session_data, None, None),
+        ):
+            with self.subTest(id=session["id"]):
+                actual = f.ScheduledTalkFactory.create_plain_fields(session)
+
+                self.assertEqual(
+                    actual,
+                    (
+                        session["id"],
+                        session["title"],
+                        session["description"],
+                        slide_url,
+                        recording_url,
+                    ),
+                )
+
     @patch(
         "pyconjp_domains.factories.ScheduledTalkFactory.calculate_duration_min"
     )
@@ -307,3 +441,69 @@ class ScheduledTalkFactoryTestCase(TestCase):
         calculate_duration_min.assert_called_once_with(
             talk_data["startsAt"], talk_data["endsAt"]
         )
+        self.speaker_factory.register_talk.assert_has_calls(
+            [call(speaker_id, actual) for speaker_id in talk_data["speakers"]]
+        )
+
+
+class ScheduledTalkFactoryCreateManyTestCase(TestCase):
+    def setUp(self):
+        from pyconjp_domains.core import create_talk_factory, filter_sessions
+
+        from .fixtures.core__create_talks_from_data import data
+
+        self.sessions = list(filter_sessions(data["sessions"]))
+        self.sut = create_talk_factory(data, self.sessions)
+
+    def test_create_many(self):
+        expected = [self.sut.create(session) for session in self.sessions]
+
+        actual = self.sut.create_many(self.sessions, use_numpy=False)
+
+        self.assertEqual(actual, expected)
+
+    def test_create_lazy(self):
+        expected = [self.sut.create(session) for session in self.sessions]
+
+        actual = [self.sut.create_lazy(session) for session in self.sessions]
+
+        self.assertEqual(actual, expected)
+
+    def test_create_many_registers_talks(self):
+        from .fixtures.core__create_talks_from_data import (
+            keynote_speaker_uuid,
+        )
+
+        actual = self.sut.create_many(self.sessions, use_numpy=False)
+
+        speaker_factory = self.sut._speaker_factory
+        self.assertEqual(
+            speaker_factory.talks_of(keynote_speaker_uuid), [actual[2]]
+        )
+        self.assertIs(
+            actual[2].speakers[0],
+            speaker_factory.create(keynote_speaker_uuid),
+        )
+
+    @skipIf(f.numpy is None, "numpy is not installed")
+    def test_create_many_with_numpy(self):
+        expected = [self.sut.create(session) for session in self.sessions]
+
+        actual = self.sut.create_many(self.sessions, use_numpy=True)
+
+        self.assertEqual(actual, expected)
+        self.assertIs(type(actual[0].duration_min), int)
+
+    def test_calculate_durations_min(self):
+        starts = ["2021-10-15T17:00:00", "2021-10-15T23:30:00"]
+        ends = ["2021-10-15T17:30:00", "2021-10-16T00:15:00"]
+
+        for use_numpy in (False, True):
+            if use_numpy and f.numpy is None:
+                continue
+            with self.subTest(use_numpy=use_numpy):
+                actual = f.ScheduledTalkFactory.calculate_durations_min(
+                    starts, ends, use_numpy
+                )
+
+                self.assertEqual(actual, [30, 45])
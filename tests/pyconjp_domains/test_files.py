@@ -0,0 +1,48 @@
+import os
+import threading
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from pyconjp_domains import files as f
+
+
+class WriteAtomicallyTestCase(TestCase):
+    def setUp(self):
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name, "timetable.csv")
+
+    def test_write(self):
+        self.path.write_bytes(b"old")
+
+        f.write_atomically(self.path, "トーク".encode("utf-8"))
+
+        self.assertEqual(self.path.read_text("utf-8"), "トーク")
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+    def test_write_from_threads(self):
+        barrier = threading.Barrier(2, timeout=5)
+        tmp_paths = []
+        replace = os.replace
+
+        def replace_after_both_written(src, dst):
+            tmp_paths.append(src)
+            barrier.wait()
+            replace(src, dst)
+
+        with patch("os.replace", side_effect=replace_after_both_written):
+            threads = [
+                threading.Thread(
+                    target=f.write_atomically, args=(self.path, content)
+                )
+                for content in (b"first", b"second")
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(set(tmp_paths)), 2)
+        self.assertIn(self.path.read_bytes(), (b"first", b"second"))
@@ -0,0 +1,90 @@
+import copy
+from unittest import TestCase
+
+import pyconjp_domains.incremental as i
+
+
+class IncrementalTalksBuilderTestCase(TestCase):
+    def setUp(self):
+        from .fixtures.core__create_talks_from_data import data, expected
+
+        self.data = copy.deepcopy(data)
+        self.expected = expected
+        self.sut = i.IncrementalTalksBuilder()
+        # buildに渡したdataは変更できないので、変更する側はコピーにする
+        self.previous = self.sut.build(copy.deepcopy(self.data))
+
+    def test_first_build(self):
+        self.assertEqual(self.previous, self.expected)
+        self.assertEqual(self.sut.rebuilt_count, len(self.expected))
+
+    def test_unchanged(self):
+        actual = self.sut.build(copy.deepcopy(self.data))
+
+        self.assertEqual(actual, self.expected)
+        self.assertEqual(self.sut.rebuilt_count, 0)
+        for talk, previous in zip(actual, self.previous):
+            self.assertIs(talk, previous)
+
+    def test_session_changed(self):
+        # トーク2 (index 3) に録画URLが追加された
+        self.data["sessions"][3]["recordingUrl"] = "https://youtu.be/xxx"
+
+        actual = self.sut.build(self.data)
+
+        self.assertEqual(self.sut.rebuilt_count, 1)
+        self.assertEqual(actual[3].recording_url, "https://youtu.be/xxx")
+        self.assertIsNot(actual[3], self.previous[3])
+        self.assertIs(actual[4], self.previous[4])
+
+    def test_talks_by_speaker(self):
+        from .fixtures.core__create_talks_from_data import (
+            speaker2_uuid,
+            speaker3_uuid,
+        )
+
+        self.data["sessions"][3]["recordingUrl"] = "https://youtu.be/xxx"
+
+        actual = self.sut.build(self.data)
+
+        # 作り直したトークも、前回のまま使うトークも引ける
+        self.assertEqual(actual.talks_by_speaker(speaker2_uuid), [actual[3]])
+        self.assertEqual(actual.talks_by_speaker(speaker3_uuid), [actual[4]])
+
+    def test_share_speakers_between_builds(self):
+        from .fixtures.core__create_talks_from_data import speaker2_uuid
+
+        # トーク2 (index 3) だけ作り直し、スピーカー2のSpeakerは前回のものを使う
+        self.data["sessions"][3]["recordingUrl"] = "https://youtu.be/xxx"
+        self.data["sessions"].append(
+            dict(
+                self.data["sessions"][3],
+                id="203099",
+                title="スピーカー2の2本目のトーク",
+            )
+        )
+
+        actual = self.sut.build(self.data)
+
+        speaker2_talks = actual.talks_by_speaker(speaker2_uuid)
+        self.assertEqual(len(speaker2_talks), 2)
+        for talk in speaker2_talks:
+            self.assertIs(talk.speakers[0], self.previous[3].speakers[0])
+
+    def test_speaker_changed(self):
+        # スピーカー3はトーク3 (index 4) だけに登壇する
+        self.data["speakers"][2]["bio"] = "更新したプロフィール"
+
+        actual = self.sut.build(self.data)
+
+        self.assertEqual(self.sut.rebuilt_count, 1)
+        self.assertEqual(actual[4].speaker_profiles, ["更新したプロフィール"])
+        self.assertIsNot(actual[4].speakers[0], self.previous[4].speakers[0])
+
+    def test_categories_changed(self):
+        self.data["categories"][0]["items"][0]["name"] = "Python core"
+
+        actual = self.sut.build(self.data)
+
+        self.assertEqual(self.sut.rebuilt_count, len(self.expected))
+        self.assertEqual(actual[3].track, "Python core")
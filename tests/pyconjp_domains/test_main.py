@@ -1,4 +1,12 @@
+import copy
+import http.client
+import io
+import os
+from contextlib import redirect_stderr
+from pathlib import Path
+from tempfile import TemporaryDirectory
 from unittest import TestCase
+from unittest.mock import patch
 
 import pyconjp_domains.__main__ as m
 
@@ -25,3 +33,128 @@ class ParseFieldArgumentsTestCase(TestCase):
             ("id", "no", "name"),
         )
         self.assertEqual(actual, expected)
+
+
+class RenderTimetableTestCase(TestCase):
+    def test_render(self):
+        from .fixtures.core__create_talks_from_data import expected
+
+        actual = m.render_timetable(
+            expected, ["id", "day", "start_time", "slot_number AS no"]
+        )
+
+        lines = actual.splitlines()
+        self.assertEqual(lines[0], "id,day,start_time,no")
+        self.assertEqual(
+            lines[1], "6a66fe7e-4a71-48b2-85ea-174d2ad98d92,10/15,12:30,"
+        )
+        self.assertEqual(len(lines), len(expected) + 1)
+
+
+class ParseArgumentsTestCase(TestCase):
+    def test_timetable(self):
+        actual = m.parse_arguments(
+            ["timetable", "timetable.csv", "--cache-dir", "c", "--record", "a"]
+        )
+
+        self.assertEqual(actual.data_type, "timetable")
+        self.assertEqual(actual.cache_dir, "c")
+        self.assertEqual(actual.record, "a")
+
+    def test_timetable_rejects_conflicting_options(self):
+        for options in (
+            ["--stream", "--cache-dir", "c"],
+            ["--stream", "--record", "a.json"],
+            ["--snapshot", "a.json", "--stream"],
+            ["--snapshot", "a.json", "--cache-dir", "c"],
+            ["--snapshot", "a.json", "--record", "b.json"],
+        ):
+            with self.subTest(options=options):
+                with redirect_stderr(io.StringIO()) as stderr:
+                    with self.assertRaises(SystemExit):
+                        m.parse_arguments(
+                            ["timetable", "timetable.csv"] + options
+                        )
+
+                self.assertIn("cannot be used with", stderr.getvalue())
+
+    def test_watch(self):
+        actual = m.parse_arguments(
+            ["watch", "timetable.csv", "--interval", "5"]
+        )
+
+        self.assertEqual(actual.data_type, "watch")
+        self.assertEqual(actual.interval, 5)
+
+    def test_watch_rejects_one_shot_options(self):
+        for option in (
+            ["--stream"],
+            ["--snapshot", "a.json"],
+            ["--record", "a.json"],
+        ):
+            with self.subTest(option=option):
+                with redirect_stderr(io.StringIO()) as stderr:
+                    with self.assertRaises(SystemExit):
+                        m.parse_arguments(["watch", "timetable.csv"] + option)
+
+                self.assertIn(option[0], stderr.getvalue())
+
+
+@patch.dict("os.environ", {"ENDPOINT_ID": "abc"})
+@patch("pyconjp_domains.__main__.time.sleep")
+@patch("pyconjp_domains.__main__.fetch_data")
+class WatchTimetableTestCase(TestCase):
+    def setUp(self):
+        from .fixtures.core__create_talks_from_data import data
+
+        self.data = data
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output = Path(directory.name, "timetable.csv")
+
+    def test_write_only_when_changed(self, fetch_data, sleep):
+        changed = copy.deepcopy(self.data)
+        changed["sessions"][3]["title"] = "トーク2（タイトル変更）"
+        fetch_data.side_effect = [
+            self.data,
+            copy.deepcopy(self.data),
+            OSError("connection refused"),
+            http.client.IncompleteRead(b"{"),
+            changed,
+        ]
+
+        with patch("os.replace", side_effect=os.replace) as replace:
+            with redirect_stderr(io.StringIO()):
+                m.watch_timetable(
+                    self.output, ["id", "title"], 60, iterations=5
+                )
+
+        self.assertEqual(replace.call_count, 2)
+        self.assertIn(
+            "トーク2（タイトル変更）", self.output.read_text("utf-8")
+        )
+        sleep.assert_called_with(60)
+
+    def test_keep_polling_after_malformed_payload(self, fetch_data, sleep):
+        malformed = copy.deepcopy(self.data)
+        malformed["sessions"][3]["speakers"] = ["unknown-speaker"]
+        changed = copy.deepcopy(self.data)
+        changed["sessions"][3]["title"] = "トーク2（タイトル変更）"
+        fetch_data.side_effect = [self.data, malformed, changed]
+
+        with redirect_stderr(io.StringIO()) as stderr:
+            m.watch_timetable(self.output, ["id", "title"], 60, iterations=3)
+
+        self.assertIn("unknown-speaker", stderr.getvalue())
+        self.assertIn(
+            "トーク2（タイトル変更）", self.output.read_text("utf-8")
+        )
+
+    def test_keep_identical_file(self, fetch_data, sleep):
+        fetch_data.return_value = self.data
+        m.watch_timetable(self.output, ["id", "title"], 60, iterations=1)
+        mtime = self.output.stat().st_mtime_ns
+
+        m.watch_timetable(self.output, ["id", "title"], 60, iterations=1)
+
+        self.assertEqual(self.output.stat().st_mtime_ns, mtime)
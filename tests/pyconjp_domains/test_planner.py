@@ -0,0 +1,52 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from pyconjp_domains import planner as p
+
+
+class QueryPlanTestCase(TestCase):
+    def setUp(self):
+        self.keywords = p.Clause(
+            "keywords", "index", 2, MagicMock(side_effect=lambda b: b & 0b0011)
+        )
+        self.tracks = p.Clause(
+            "tracks", "bitset", 3, MagicMock(side_effect=lambda b: b & 0b1110)
+        )
+        self.levels = p.Clause(
+            "levels", "bitset", 1, MagicMock(side_effect=lambda b: b & 0b1000)
+        )
+
+    def test_order(self):
+        plan = p.QueryPlan([self.keywords, self.tracks, self.levels])
+
+        self.assertEqual(plan.steps, [self.levels, self.tracks, self.keywords])
+
+    def test_execute(self):
+        plan = p.QueryPlan([self.keywords, self.tracks])
+
+        actual = plan.execute(0b1111)
+
+        self.assertEqual(actual, 0b0010)
+        self.keywords.apply.assert_called_once_with(0b1110)
+
+    def test_execute_short_circuit(self):
+        plan = p.QueryPlan([self.keywords, self.tracks, self.levels])
+
+        actual = plan.execute(0b0111)
+
+        self.assertEqual(actual, 0)
+        self.tracks.apply.assert_not_called()
+        self.keywords.apply.assert_not_called()
+
+    def test_explain(self):
+        plan = p.QueryPlan([self.keywords, self.levels])
+
+        actual = plan.explain()
+
+        self.assertEqual(
+            actual,
+            [
+                {"clause": "levels", "method": "bitset", "estimated_rows": 1},
+                {"clause": "keywords", "method": "index", "estimated_rows": 2},
+            ],
+        )
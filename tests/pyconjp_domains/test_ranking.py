@@ -0,0 +1,77 @@
+from unittest import TestCase, skipIf
+
+from pyconjp_domains import ranking as r
+
+
+class TermsOfTestCase(TestCase):
+    def test_terms_of(self):
+        actual = r.terms_of("ＰｙＣｏｎ 型 ヒント")
+
+        self.assertEqual(
+            actual, ["py", "yc", "co", "on", "型", "ヒン", "ント"]
+        )
+
+
+class BM25IndexTestCase(TestCase):
+    def setUp(self):
+        self.index = r.BM25Index(
+            [
+                "非同期処理とasyncio",
+                "型ヒント。型ヒントで型ヒントを書く",
+                "型ヒントの入門",
+                "機械学習",
+            ]
+        )
+
+    def test_scores(self):
+        actual = self.index.scores("型ヒント")
+
+        self.assertEqual(set(actual), {1, 2})
+        self.assertGreater(actual[1], actual[2])
+
+    def test_top_k(self):
+        actual = self.index.top_k("型ヒント 機械学習", 2)
+
+        self.assertEqual([position for position, _ in actual], [3, 1])
+
+    def test_top_k_ties(self):
+        index = r.BM25Index(["テスト", "テスト", "テスト"])
+
+        actual = index.top_k("テスト", 2)
+
+        self.assertEqual([position for position, _ in actual], [0, 1])
+
+    def test_top_k_not_found(self):
+        self.assertEqual(self.index.top_k("django", 3), [])
+
+    @skipIf(r.numpy is None, "numpy is not installed")
+    def test_top_k_with_numpy(self):
+        index = r.BM25Index(["テスト"] * 3 + ["型ヒントのテスト", "型ヒント"])
+
+        for query in ("テスト", "型ヒント テスト", "django"):
+            with self.subTest(query=query):
+                actual = index.top_k(query, 2, use_numpy=True)
+
+                self.assertEqual(
+                    actual, index.top_k(query, 2, use_numpy=False)
+                )
+
+    def test_top_k_not_positive(self):
+        use_numpy_options = [False] if r.numpy is None else [False, True]
+        for use_numpy in use_numpy_options:
+            for k in (0, -1):
+                with self.subTest(use_numpy=use_numpy, k=k):
+                    actual = self.index.top_k("型ヒント", k, use_numpy)
+
+                    self.assertEqual(actual, [])
+
+    def test_empty_texts(self):
+        index = r.BM25Index(["", " "])
+
+        self.assertEqual(index.top_k("テスト", 1), [])
+
+    def test_idf(self):
+        # 多くの文書に現れる語ほど重みが小さい
+        index = r.BM25Index(["型の話", "型の本", "型と本"])
+
+        self.assertLess(index.scores("型の")[0], index.scores("の話")[0])
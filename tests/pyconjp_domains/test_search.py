@@ -0,0 +1,75 @@
+from unittest import TestCase
+
+from pyconjp_domains import search as s
+
+
+class NgramsTestCase(TestCase):
+    def test_ngrams(self):
+        self.assertEqual(s.ngrams("abcd", 3), {"abc", "bcd"})
+        self.assertEqual(s.ngrams("ab", 3), set())
+
+
+class NormalizeTestCase(TestCase):
+    def test_normalize(self):
+        self.assertEqual(s.normalize("ＰｙＣｏｎ　ＪＰ"), "pycon jp")
+        self.assertEqual(s.normalize("ﾃｽﾄ駆動"), "テスト駆動")
+
+
+class NgramIndexTestCase(TestCase):
+    def setUp(self):
+        self.index = s.NgramIndex(
+            [
+                "pythonで型ヒントを書く",
+                "非同期処理とasyncio",
+                "型ヒントとasyncio",
+            ]
+        )
+
+    def test_search(self):
+        self.assertEqual(self.index.search(["型ヒント"]), [0, 2])
+        self.assertEqual(self.index.search(["asyncio"]), [1, 2])
+
+    def test_search_and(self):
+        actual = self.index.search(["型ヒント", "asyncio"])
+
+        self.assertEqual(actual, [2])
+
+    def test_search_short_keyword(self):
+        self.assertEqual(self.index.search(["型"]), [0, 2])
+        self.assertEqual(self.index.search(["io"]), [1, 2])
+
+    def test_search_verifies_candidates(self):
+        # 0番目は "ヒントを書" の3-gramを全て含むが、キーワードそのものは含まない
+        index = s.NgramIndex(["ヒントと、ントを書く", "ヒントを書く"])
+
+        actual = index.search(["ヒントを書"])
+
+        self.assertEqual(actual, [1])
+
+    def test_search_not_found(self):
+        self.assertEqual(self.index.search(["django"]), [])
+
+    def test_search_empty_keyword(self):
+        self.assertEqual(self.index.search([""]), [0, 1, 2])
+
+    def test_search_candidates(self):
+        self.assertEqual(self.index.search(["asyncio"], [0, 2]), [2])
+        self.assertEqual(self.index.search([""], [2, 0]), [0, 2])
+        self.assertEqual(self.index.search(["django"], [0, 1, 2]), [])
+
+    def test_estimate(self):
+        self.assertEqual(self.index.estimate(["型ヒント", "非同期"]), 1)
+        self.assertEqual(self.index.estimate(["django"]), 0)
+        self.assertEqual(self.index.estimate([""]), 3)
+
+
+class BigramIndexTestCase(TestCase):
+    def setUp(self):
+        self.index = s.NgramIndex(
+            ["型ヒントを書く", "非同期処理", "型とヒント"], n=2
+        )
+
+    def test_search(self):
+        self.assertEqual(self.index.search(["ヒント"]), [0, 2])
+        self.assertEqual(self.index.search(["型ヒ"]), [0])
+        self.assertEqual(self.index.search(["型", "ヒント"]), [0, 2])
@@ -0,0 +1,78 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import pyconjp_domains.snapshots as s
+
+URL = "https://sessionize.com/api/v2/abc123/view/All"
+
+
+class SnapshotNameTestCase(TestCase):
+    def test_sessionize_url(self):
+        actual = s.snapshot_name(URL)
+
+        self.assertEqual(actual, "abc123.json")
+
+    def test_other_url(self):
+        actual = s.snapshot_name("http://127.0.0.1:8000/all.json")
+
+        self.assertRegex(actual, r"^[0-9a-f]{64}\.json$")
+
+
+class ResolveSnapshotsTestCase(TestCase):
+    def setUp(self):
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        for name in ("def456.json", "abc123.json", "memo.txt"):
+            (self.directory / name).write_bytes(b"{}")
+
+    def test_file(self):
+        path = self.directory / "def456.json"
+
+        actual = s.resolve_snapshots(path, URL)
+
+        self.assertEqual(actual, [path])
+
+    def test_directory_with_url(self):
+        actual = s.resolve_snapshots(self.directory, URL)
+
+        self.assertEqual(actual, [self.directory / "abc123.json"])
+
+    def test_directory(self):
+        actual = s.resolve_snapshots(self.directory)
+
+        self.assertEqual(
+            actual,
+            [self.directory / "abc123.json", self.directory / "def456.json"],
+        )
+
+
+class SaveSnapshotTestCase(TestCase):
+    def setUp(self):
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def test_save_to_directory(self):
+        actual = s.save_snapshot(self.directory, URL, b'{"sessions": []}')
+
+        self.assertEqual(actual, self.directory / "abc123.json")
+        with s.open_snapshot(actual) as mapped:
+            self.assertEqual(mapped.read(), b'{"sessions": []}')
+
+    def test_save_to_file(self):
+        path = self.directory / "2021.json"
+
+        actual = s.save_snapshot(path, URL, b"{}")
+
+        self.assertEqual(actual, path)
+        self.assertEqual(path.read_bytes(), b"{}")
+
+    def test_open_empty(self):
+        path = self.directory / "empty.json"
+        path.write_bytes(b"")
+
+        with self.assertRaises(ValueError):
+            with s.open_snapshot(path):
+                pass
@@ -0,0 +1,44 @@
+import io
+import json
+from unittest import TestCase
+
+import pyconjp_domains.streaming as s
+
+
+class IterSectionsTestCase(TestCase):
+    def test_iter_sections(self):
+        document = {
+            "sessions": [{"id": "1", "title": "トーク1"}, {"id": "2"}],
+            "speakers": [],
+            "questions": [{"id": 30014, "question": "Elevator Pitch"}],
+            "count": 12345,
+        }
+        expected = [
+            ("sessions", {"id": "1", "title": "トーク1"}),
+            ("sessions", {"id": "2"}),
+            ("questions", {"id": 30014, "question": "Elevator Pitch"}),
+            ("count", 12345),
+        ]
+        stream = io.BytesIO(
+            json.dumps(document, ensure_ascii=False, indent=2).encode("utf-8")
+        )
+
+        # マルチバイト文字や数値がチャンクの境目で切れても正しく読めること
+        for chunk_size in (1, 3, 7, 1024):
+            with self.subTest(chunk_size=chunk_size):
+                stream.seek(0)
+
+                actual = list(s.iter_sections(stream, chunk_size))
+
+                self.assertEqual(actual, expected)
+
+    def test_empty_object(self):
+        actual = list(s.iter_sections(io.BytesIO(b" {} ")))
+
+        self.assertEqual(actual, [])
+
+    def test_truncated(self):
+        stream = io.BytesIO(b'{"sessions": [{"id": "1"}, {"id"')
+
+        with self.assertRaises(ValueError):
+            list(s.iter_sections(stream, 4))
@@ -1,7 +1,11 @@
+import pickle
 from datetime import date, time
 from unittest import TestCase
+from unittest.mock import MagicMock
 
 from pyconjp_domains import talks as t
+from pyconjp_domains.categorical import LANGUAGES, ROOMS, TRACKS
+from pyconjp_domains.factories import ScheduledTalkFactory
 
 
 class CategoryTestCase(TestCase):
@@ -128,6 +132,23 @@ class TalkTestCase(TestCase):
 
         self.assertEqual(actual, ["いくつかのすごい経歴"])
 
+    def test_search_text(self):
+        actual = self.talk.search_text
+
+        self.assertEqual(
+            actual,
+            "talkのプロパティのテスト\nプロパティを作ります\n"
+            "pythonのunittestを使った経験\n"
+            "テストを先に書いてred\r\n実装してgreenという体験",
+        )
+        self.assertIs(self.talk.search_text, actual)
+
+    def test_search_text_skips_none(self):
+        self.talk.title = "Straße"
+        self.talk.answer = t.QuestionAnswer(None, "前提知識", None)
+
+        self.assertEqual(self.talk.search_text, "strasse\n前提知識")
+
 
 class TalksTestCase(TestCase):
     def test_from_raw_json(self):
@@ -198,6 +219,190 @@ class TalksTestCase(TestCase):
         self.assertEqual(actual, expected)
 
 
+class TalksFilterByTestCase(TestCase):
+    def setUp(self):
+        def talk(id, category):
+            return t.Talk(
+                id,
+                f"トーク{id}",
+                None,
+                category,
+                t.QuestionAnswer("ピッチ", "前提知識", "持ち帰れるもの"),
+                [],
+            )
+
+        self.talks = t.Talks(
+            [
+                talk(
+                    1,
+                    t.Category(
+                        "Web programming",
+                        "Beginner",
+                        "Japanese",
+                        "Japanese only",
+                    ),
+                ),
+                talk(
+                    2,
+                    t.Category(
+                        "Machine learning",
+                        "Advanced",
+                        "English",
+                        "English only",
+                    ),
+                ),
+                talk(
+                    3,
+                    t.Category(
+                        "Web programming", "Advanced", "Japanese", "Both"
+                    ),
+                ),
+            ]
+        )
+        self.request = {
+            "tracks": [],
+            "levels": [],
+            "keywords": [],
+            "is_english_only": False,
+        }
+
+    def assertFiltered(self, request, expected_ids):
+        actual = self.talks.filter_by({**self.request, **request})
+
+        self.assertEqual([talk.id for talk in actual], expected_ids)
+
+    def test_tracks(self):
+        self.assertFiltered({"tracks": ["Web programming"]}, [1, 3])
+        self.assertFiltered({"tracks": ["Unknown track"]}, [])
+
+    def test_levels(self):
+        self.assertFiltered({"levels": ["Advanced", "All"]}, [2, 3])
+
+    def test_is_english_only(self):
+        self.assertFiltered({"is_english_only": True}, [2, 3])
+
+    def test_keywords(self):
+        self.talks.talks[1].answer.elevator_pitch = "asyncioのピッチ"
+
+        self.assertFiltered({"keywords": ["トーク"]}, [1, 2, 3])
+        self.assertFiltered({"keywords": ["ピッチ", "asyncio"]}, [2])
+        self.assertFiltered(
+            {"keywords": ["asyncio"], "levels": ["Beginner"]}, []
+        )
+        self.assertFiltered(
+            {"keywords": ["トーク3"], "tracks": ["Web programming"]}, [3]
+        )
+
+    def test_fields_changed(self):
+        self.talks.talks[1].category.track = "Web programming"
+        self.talks.talks[0].category.level = "Expert"
+        self.talks.talks[0].category.speaking_language = "English"
+
+        self.assertFiltered({"tracks": ["Web programming"]}, [1, 2, 3])
+        self.assertFiltered({"levels": ["Expert"]}, [1])
+        self.assertFiltered({"is_english_only": True}, [1, 2, 3])
+
+    def test_keywords_scan_before_index(self):
+        request = {**self.request, "keywords": ["トーク3"]}
+
+        # 1度目の絞り込みは本文を走査し、2度目からインデックスを使う
+        for method in ("scan", "index", "index"):
+            with self.subTest(method=method):
+                self.assertEqual(
+                    [step["method"] for step in self.talks.explain(request)],
+                    [method],
+                )
+                self.assertFiltered(request, [3])
+
+    def test_keywords_are_case_insensitive(self):
+        self.talks.talks[0].title = "Djangoのトーク"
+
+        self.assertFiltered({"keywords": ["django"]}, [1])
+        self.assertFiltered({"keywords": ["DJANGO"]}, [1])
+
+    def test_keywords_without_answer(self):
+        self.talks.talks[0].answer = None
+
+        self.assertFiltered({"keywords": ["持ち帰れる"]}, [2, 3])
+
+    def test_talk_without_category(self):
+        self.talks.talks.append(t.Talk(4, "Opening", None, None, None, []))
+
+        self.assertFiltered({"tracks": ["Web programming"]}, [1, 3])
+        self.assertFiltered({"keywords": ["opening"]}, [4])
+
+    def test_search_full_text(self):
+        self.talks.talks[0].title = "ＰｙＣｏｎ ＪＰのﾃｽﾄ"
+        self.talks.talks[1].description = "テスト駆動開発"
+        self.talks.talks[2].speakers = [t.Speaker("すごい人")]
+
+        cases = {
+            "pycon": [1],
+            "テスト": [1, 2],
+            "ﾃｽﾄ　駆動": [2],
+            "すごい人": [3],
+            "トーク ピッチ": [2, 3],
+            "django": [],
+            " ": [1, 2, 3],
+        }
+        for query, expected_ids in cases.items():
+            with self.subTest(query=query):
+                actual = self.talks.search_full_text(query)
+
+                self.assertEqual([talk.id for talk in actual], expected_ids)
+
+    def test_search(self):
+        self.talks.talks[0].description = "asyncioの話。asyncioでasyncioを使う"
+        self.talks.talks[2].title = "asyncio入門"
+
+        actual = self.talks.search("ASYNCIO", k=1)
+
+        self.assertEqual([talk.id for talk in actual], [1])
+        self.assertEqual(
+            [talk.id for talk in self.talks.search("asyncio")], [1, 3]
+        )
+        self.assertEqual(len(self.talks.search("django")), 0)
+
+    def test_explain(self):
+        request = {
+            **self.request,
+            "tracks": ["Web programming"],
+            "levels": ["Beginner"],
+            "keywords": ["トーク"],
+        }
+
+        actual = self.talks.explain(request)
+
+        self.assertEqual(
+            [step["clause"] for step in actual],
+            ["levels", "tracks", "keywords"],
+        )
+        self.assertEqual(
+            [step["estimated_rows"] for step in actual], [1, 2, 3]
+        )
+
+    def test_facet_counts(self):
+        request = {
+            **self.request,
+            "tracks": ["Web programming"],
+            "levels": ["Advanced"],
+        }
+
+        actual = self.talks.facet_counts(request)
+
+        self.assertEqual(
+            actual["track"], {"Web programming": 1, "Machine learning": 1}
+        )
+        self.assertEqual(actual["level"], {"Beginner": 1, "Advanced": 1})
+        self.assertEqual(
+            actual["speaking_language"], {"Japanese": 1, "English": 0}
+        )
+        self.assertEqual(
+            actual["slide_language"],
+            {"Japanese only": 0, "English only": 0, "Both": 1},
+        )
+
+
 class ScheduledTalkTestCase(TestCase):
     def setUp(self):
         self.talk = t.ScheduledTalk(
@@ -337,3 +542,235 @@ class ScheduledTalksTestCase(TestCase):
         actual = talks.sorted()
 
         self.assertEqual(actual, expected)
+
+    def test_sorted_after_room_changed(self):
+        talks = t.ScheduledTalks(
+            [
+                t.ScheduledTalk(
+                    str(number),
+                    f"トーク{number}",
+                    None,
+                    None,
+                    None,
+                    [],
+                    t.Slot(room, date(2021, 10, 15), time(15, 0), 1),
+                    30,
+                )
+                for number, room in ((1, "#pyconjp_1"), (2, "#pyconjp_2"))
+            ]
+        )
+
+        talks[0].slot.room = "#pyconjp_3"
+        actual = talks.sorted()
+
+        self.assertEqual([talk.id for talk in actual], ["2", "1"])
+
+
+class ScheduledTalksBySpeakerTestCase(TestCase):
+    def setUp(self):
+        slot1 = t.Slot("#pyconjp_2", date(2021, 10, 15), time(15, 0), 1)
+        slot2 = t.Slot("#pyconjp_1", date(2021, 10, 15), time(15, 0), 1)
+        self.talk1 = t.ScheduledTalk(
+            "1", "トーク1", None, None, None, [], slot1, 30
+        )
+        self.talk2 = t.ScheduledTalk(
+            "2", "トーク2", None, None, None, [], slot2, 30
+        )
+        self.talks = t.ScheduledTalks(
+            [self.talk1, self.talk2],
+            {"speaker1": [self.talk1, self.talk2], "speaker2": [self.talk2]},
+        )
+
+    def test_talks_by_speaker(self):
+        actual = self.talks.talks_by_speaker("speaker1")
+
+        self.assertEqual(actual, [self.talk1, self.talk2])
+        self.assertEqual(self.talks.talks_by_speaker("unknown"), [])
+
+    def test_sorted(self):
+        actual = self.talks.sorted()
+
+        self.assertEqual(actual.talks, [self.talk2, self.talk1])
+        self.assertEqual(
+            actual.talks_by_speaker("speaker1"), [self.talk1, self.talk2]
+        )
+
+    def test_slice(self):
+        actual = self.talks[:1]
+
+        self.assertEqual(actual.talks_by_speaker("speaker1"), [self.talk1])
+        self.assertEqual(actual.talks_by_speaker("speaker2"), [])
+
+    def test_concatenate(self):
+        other = t.ScheduledTalks([self.talk1], {"speaker2": [self.talk1]})
+
+        actual = t.ScheduledTalks.concatenate([self.talks, other])
+
+        self.assertEqual(actual.talks, [self.talk1, self.talk2, self.talk1])
+        self.assertEqual(
+            actual.talks_by_speaker("speaker2"), [self.talk2, self.talk1]
+        )
+
+
+class LazyScheduledTalkTestCase(TestCase):
+    def setUp(self):
+        self.session = {
+            "id": "203012",
+            "title": "遅延して作るトーク",
+            "description": "詳細",
+            "isServiceSession": False,
+            "liveUrl": "https://example.com/slide",
+            "recordingUrl": None,
+        }
+        self.factory = MagicMock()
+        self.factory.create_plain_fields.side_effect = (
+            ScheduledTalkFactory.create_plain_fields
+        )
+        self.factory.create_slot.return_value = t.Slot(
+            "#pyconjp_1", date(2021, 10, 15), time(13, 30), 2
+        )
+        self.talk = t.LazyScheduledTalk(self.session, self.factory)
+
+    def test_inheritance(self):
+        self.assertIsInstance(self.talk, t.ScheduledTalk)
+
+    def test_build_only_accessed_fields(self):
+        self.assertEqual(self.talk.title, "遅延して作るトーク")
+        self.assertEqual(self.talk.room, "#pyconjp_1")
+        self.assertEqual(self.talk.start_time, time(13, 30))
+
+        self.factory.create_slot.assert_called_once_with(self.session)
+        self.factory.create_category.assert_not_called()
+        self.factory.create_answer.assert_not_called()
+        self.factory.create_speakers.assert_not_called()
+
+    def test_cache_built_field(self):
+        self.talk.category
+        self.talk.category
+
+        self.factory.create_category.assert_called_once_with(self.session)
+
+    def test_search_text(self):
+        self.factory.create_answer.return_value = None
+
+        self.assertEqual(self.talk.search_text, "遅延して作るトーク")
+        self.factory.create_category.assert_not_called()
+
+    def test_materialize(self):
+        self.factory.create_category.return_value = None
+        self.factory.create_answer.return_value = None
+        self.factory.create_speakers.return_value = []
+        self.factory.create_duration_min.return_value = 30
+        expected = t.ScheduledTalk(
+            "203012",
+            "遅延して作るトーク",
+            "詳細",
+            None,
+            None,
+            [],
+            t.Slot("#pyconjp_1", date(2021, 10, 15), time(13, 30), 2),
+            30,
+            "https://example.com/slide",
+            None,
+        )
+
+        actual = self.talk.materialize()
+
+        self.assertIs(type(actual), t.ScheduledTalk)
+        self.assertEqual(actual, expected)
+        self.assertEqual(self.talk, expected)
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            self.talk.unknown
+
+
+class SlottedTestCase(TestCase):
+    def setUp(self):
+        self.talk = t.ScheduledTalk(
+            123456,
+            "スロットのテスト",
+            "テスト",
+            t.Category("Web programming", "Beginner", "Japanese", "Both"),
+            t.QuestionAnswer("ピッチ", "前提知識", "持ち帰れるもの"),
+            [t.Speaker("すごい人")],
+            t.Slot("#pyconjp_1", date(2021, 10, 15), time(13, 30), 2),
+            30,
+        )
+
+    def test_no_instance_dict(self):
+        instances = [
+            self.talk,
+            self.talk.category,
+            self.talk.answer,
+            self.talk.speakers[0],
+            self.talk.slot,
+            t.Talk(1, "トーク", None, None, None, []),
+        ]
+
+        for instance in instances:
+            with self.subTest(instance=type(instance).__name__):
+                self.assertFalse(hasattr(instance, "__dict__"))
+
+    def test_defaults(self):
+        self.assertIsNone(t.Speaker("すごい人").profile)
+        self.assertIsNone(self.talk.slide_url)
+        self.assertIsNone(self.talk.recording_url)
+
+    def test_pickle(self):
+        actual = pickle.loads(pickle.dumps(self.talk))
+
+        self.assertEqual(actual, self.talk)
+        self.assertEqual(
+            actual.category.track_code, TRACKS.code_of("Web programming")
+        )
+        self.assertEqual(actual.slot.room_code, ROOMS.code_of("#pyconjp_1"))
+
+
+class CategoricalCodesTestCase(TestCase):
+    def test_category_codes(self):
+        category = t.Category(
+            "".join(["Web ", "programming"]), None, "English", "English only"
+        )
+
+        self.assertEqual(
+            category.track_code, TRACKS.code_of("Web programming")
+        )
+        self.assertIs(category.track, TRACKS.decode(category.track_code))
+        self.assertEqual(category.level_code, -1)
+        self.assertNotEqual(
+            category.speaking_language_code, category.slide_language_code
+        )
+        self.assertEqual(
+            category.speaking_language_code, LANGUAGES.code_of("English")
+        )
+
+    def test_codes_not_compared(self):
+        category = t.Category(
+            "Web programming", "Beginner", "Japanese", "Both"
+        )
+
+        self.assertEqual(
+            category,
+            t.Category("Web programming", "Beginner", "Japanese", "Both"),
+        )
+        self.assertNotIn("track_code", repr(category))
+
+    def test_codes_follow_fields(self):
+        category = t.Category(
+            "Web programming", "Beginner", "Japanese", "Both"
+        )
+        slot = t.Slot("#pyconjp_1", date(2021, 10, 15), time(13, 30), 2)
+
+        category.track = "Machine learning"
+        slot.room = "#pyconjp_3"
+
+        self.assertEqual(
+            category.track_code, TRACKS.code_of("Machine learning")
+        )
+        self.assertEqual(slot.room_code, ROOMS.code_of("#pyconjp_3"))
+
+    def test_slot_room_code(self):
+        slot = t.Slot("#pyconjp_1", date(2021, 10, 15), time(13, 30), 2)
+
+        self.assertEqual(ROOMS.decode(slot.room_code), "#pyconjp_1")
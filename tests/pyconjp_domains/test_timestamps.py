@@ -0,0 +1,24 @@
+from datetime import datetime
+from unittest import TestCase
+
+import pyconjp_domains.timestamps as t
+
+
+class ParseSessionizeDatetimeTestCase(TestCase):
+    def test_parse(self):
+        actual = t.parse_sessionize_datetime("2021-10-15T15:00:00")
+
+        self.assertEqual(actual, datetime(2021, 10, 15, 15, 0))
+
+    def test_cached(self):
+        actual = t.parse_sessionize_datetime("2021-10-16T13:50:00")
+
+        self.assertIs(
+            actual, t.parse_sessionize_datetime("2021-10-16T13:50:00")
+        )
+
+    def test_invalid(self):
+        for string in ["2021-10-15 15:00:00", "2021-10-15T15:00", "15:00"]:
+            with self.subTest(string=string):
+                with self.assertRaises(ValueError):
+                    t.parse_sessionize_datetime(string)